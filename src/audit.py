@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# compliance_check field -> (value that counts as a failure, report label)
+COMPLIANCE_CHECKS = {
+    "hipaa_compliant": (False, "HIPAA Review Needed"),
+    "phi_disclosed": (True, "PHI Disclosed"),
+    "required_disclaimers_given": (False, "Disclaimers Missing"),
+    "consent_verified": (False, "Consent Missing"),
+    "documentation_complete": (False, "Documentation Incomplete")
+}
+
+QUALITY_SCORES = {
+    "clarity_score": "Clarity",
+    "resolution_completeness": "Resolution",
+    "customer_satisfaction_predicted": "Satisfaction"
+}
+
+QUALITY_FLAGS = {
+    "follow_up_needed": "Follow-up Needed",
+    "escalation_required": "Escalation Required"
+}
+
+BREAKDOWNS = {
+    "department": "Department",
+    "agent": "Agent",
+    "category": "Category"
+}
+
+FAILURE_COLUMNS = [f"fail_{check}" for check in COMPLIANCE_CHECKS]
+SCORE_BINS = np.arange(0, 105, 5)
+
+
+def flatten_audit_frame(calls):
+    # One pass over the nested call dicts into flat column lists; everything
+    # after this works on whole columns at once.
+    columns = {name: [] for name in ("call_id", "customer_name", "timestamp", *BREAKDOWNS)}
+    columns.update({check: [] for check in COMPLIANCE_CHECKS})
+    columns.update({score: [] for score in QUALITY_SCORES})
+    columns.update({flag: [] for flag in QUALITY_FLAGS})
+
+    for call in calls:
+        analysis = call["analysis"]
+        compliance = analysis["compliance_check"]
+        quality = analysis["call_quality"]
+        columns["call_id"].append(call["call_id"])
+        columns["customer_name"].append(call["customer_name"])
+        columns["timestamp"].append(call["timestamp"])
+        columns["department"].append(call["metadata"]["department"])
+        columns["agent"].append(call["metadata"]["assigned_to"])
+        columns["category"].append(call["category"])
+        for check in COMPLIANCE_CHECKS:
+            columns[check].append(compliance[check])
+        for score in QUALITY_SCORES:
+            columns[score].append(quality[score])
+        for flag in QUALITY_FLAGS:
+            columns[flag].append(quality[flag])
+
+    frame = pd.DataFrame({
+        name: np.asarray(values, dtype=bool) if name in COMPLIANCE_CHECKS or name in QUALITY_FLAGS
+        else np.asarray(values, dtype=np.int16) if name in QUALITY_SCORES
+        else values
+        for name, values in columns.items()
+    })
+    for name in BREAKDOWNS:
+        frame[name] = frame[name].astype("category")
+
+    for (check, (failing_value, _)), column in zip(COMPLIANCE_CHECKS.items(), FAILURE_COLUMNS):
+        frame[column] = frame[check].to_numpy() == failing_value
+    frame["fail_any"] = frame[FAILURE_COLUMNS].to_numpy().any(axis=1)
+    return frame
+
+
+def failure_rates(frame, by=None):
+    # Share of calls failing each check, overall or per breakdown group
+    columns = FAILURE_COLUMNS + ["fail_any"]
+    labels = [label for _, label in COMPLIANCE_CHECKS.values()] + ["Any Failure"]
+    if by is None:
+        rates = frame[columns].mean().to_frame("Failure Rate").T
+        rates.insert(0, "calls", len(frame))
+    else:
+        grouped = frame.groupby(by, observed=True)
+        rates = grouped[columns].mean()
+        rates.insert(0, "calls", grouped.size())
+        rates = rates.sort_values("fail_any", ascending=False)
+    return rates.rename(columns=dict(zip(columns, labels)))
+
+
+def score_summary(frame, by=None):
+    scores = list(QUALITY_SCORES)
+    if by is None:
+        summary = frame[scores].describe(percentiles=[0.05, 0.5, 0.95]).T
+    else:
+        summary = frame.groupby(by, observed=True)[scores].mean()
+    return summary.rename(index=QUALITY_SCORES, columns=QUALITY_SCORES)
+
+
+def score_distribution(frame):
+    # Histogram counts per 5-point bin for every quality score
+    return pd.DataFrame(
+        {label: np.histogram(frame[score].to_numpy(), bins=SCORE_BINS)[0]
+         for score, label in QUALITY_SCORES.items()},
+        index=[f"{low}-{low + 4}" for low in SCORE_BINS[:-1]]
+    )
+
+
+def failing_calls(frame, check=None, group_by=None, group=None):
+    mask = frame["fail_any"].to_numpy() if check is None else frame[f"fail_{check}"].to_numpy()
+    if group_by is not None and group is not None:
+        mask = mask & (frame[group_by].to_numpy() == group)
+    columns = ["call_id", "timestamp", "customer_name", *BREAKDOWNS, *FAILURE_COLUMNS, *QUALITY_SCORES]
+    failing = frame.loc[mask, columns]
+    return failing.rename(columns={
+        **{column: label for column, (_, label) in zip(FAILURE_COLUMNS, COMPLIANCE_CHECKS.values())},
+        **QUALITY_SCORES
+    })
@@ -0,0 +1,279 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+# Micro-benchmarks for the dashboard and batch code paths:
+#
+#   python src/benchmarks.py cold-start
+#   python src/benchmarks.py generation
+#   python src/benchmarks.py dedup
+#   python src/benchmarks.py replay
+#   python src/benchmarks.py search
+#   python src/benchmarks.py shards
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_COLD_START_SCRIPT = """
+import time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+loaded = time.perf_counter()
+AppTest.from_file("main.py", default_timeout=60).run()
+print(loaded - started, time.perf_counter() - loaded)
+"""
+
+
+def bench_cold_start(runs=5):
+    # Every run is a fresh interpreter, so the first script run pays for all
+    # of the app's own imports on top of Streamlit's.
+    streamlit_times, first_run_times = [], []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _COLD_START_SCRIPT], cwd=SRC_DIR,
+            env={**os.environ, "PYTHONPATH": SRC_DIR}, capture_output=True, text=True, check=True
+        ).stdout.split()
+        streamlit_times.append(float(output[-2]))
+        first_run_times.append(float(output[-1]))
+    print(f"import streamlit        median {statistics.median(streamlit_times) * 1000:8.1f} ms")
+    print(f"first script run        median {statistics.median(first_run_times) * 1000:8.1f} ms")
+
+
+def bench_generation(number=1000, repeat=20):
+    import generators
+
+    cases = [
+        ("generate_sample_calls (per call)", lambda: generators.generate_sample_calls(1)),
+        ("generate_voicemail_message", lambda: generators.generate_voicemail_message("Sarah Johnson")),
+        ("generate_varied_summary", generators.generate_varied_summary),
+        ("generate_call_metadata", generators.generate_call_metadata),
+        ("generate_enhanced_call_analysis", generators.generate_enhanced_call_analysis),
+    ]
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=number, repeat=repeat)) / number
+        print(f"{name:<34} {best * 1e6:8.1f} us/call")
+
+
+def bench_dedup(sizes=(1_000, 10_000, 100_000)):
+    # Thread grouping time, and a check that no thread mixes RX numbers:
+    # each thread is analyzed once, so a mixed thread hides a prescription
+    from dedup import extract_rx_number, group_calls
+    import generators
+
+    for size in sizes:
+        calls = generators.generate_sample_calls(size)
+        started = time.perf_counter()
+        threads = group_calls(calls)
+        elapsed = time.perf_counter() - started
+        mixed = sum(
+            len({extract_rx_number(c["voicemail_data"]) for c in thread["calls"]} - {None}) > 1
+            for thread in threads
+        )
+        print(f"{size:>8,} calls  {elapsed:6.2f}s  {len(threads):>8,} threads  "
+              f"largest {max(t['size'] for t in threads):>3}  mixed RX {mixed}")
+        if mixed:
+            raise SystemExit(f"{mixed} threads mix RX numbers")
+
+
+def bench_replay(events=2_000_000, calls=10_000, tail=100_000):
+    # Ingest `calls` generated calls, then append lifecycle events for them
+    # until the log holds `events` frames, and time rebuilding the state
+    # from the full log versus from a snapshot plus the last `tail` events.
+    from eventlog import EventLog
+    import generators
+
+    inbox = generators.generate_sample_calls(calls)
+    with tempfile.TemporaryDirectory() as directory:
+        log = EventLog(directory, snapshot_every=events + 1)
+        started = time.perf_counter()
+        for call in inbox:
+            log.append("ingested", call["call_id"], call=call, batch="bench")
+        for i in range(events - calls):
+            call_id = inbox[i % calls]["call_id"]
+            if i % 2:
+                log.append("status_changed", call_id, status=generators.NON_URGENT_STATUSES[i % 3])
+            else:
+                log.append("called_back", call_id)
+            if i == events - calls - tail - 1:
+                log.snapshot()
+        appended = time.perf_counter() - started
+        log.close()
+        size_mb = os.path.getsize(log.path) / 1e6
+        print(f"append                  {events / appended:12,.0f} events/s ({size_mb:,.0f} MB log)")
+
+        snapshot_dir = os.path.join(directory, "with-snapshot")
+        os.makedirs(snapshot_dir)
+        for name in os.listdir(directory):
+            if name.startswith("snapshot-"):
+                os.rename(os.path.join(directory, name), os.path.join(snapshot_dir, name))
+        os.link(log.path, os.path.join(snapshot_dir, "events.log"))
+
+        for label, path in (("full replay", directory), ("snapshot + tail", snapshot_dir)):
+            started = time.perf_counter()
+            replay = EventLog(path, snapshot_every=events + 1)
+            elapsed = time.perf_counter() - started
+            replay.close()
+            print(f"{label:<23} {replay.replayed:12,} events in {elapsed:6.2f}s "
+                  f"({replay.replayed / elapsed:,.0f} events/s)")
+
+
+def bench_search(calls=300_000, repeat=50):
+    # Search box latency over a year of voicemails: indexing them, then the
+    # queries staff type, each timed for the page of hits plus the total.
+    # Calls are added in shuffled order, so newest-first paging is checked
+    # against the calls' timestamps rather than the order they were indexed.
+    import random
+
+    from dedup import extract_rx_number
+    from search import VoicemailSearchIndex
+    import generators
+
+    history = generators.generate_history_calls(calls_per_day=-(-calls // 365))
+    random.shuffle(history)
+    index = VoicemailSearchIndex()
+    started = time.perf_counter()
+    index.add_calls(history)
+    elapsed = time.perf_counter() - started
+    print(f"indexed {len(history):,} voicemails in {elapsed:.1f}s ({len(history) / elapsed:,.0f}/s)")
+
+    sample = next(call for call in history if extract_rx_number(call["voicemail_data"]))
+    queries = {
+        "common word": ("prescription", 1),
+        "rare word": ("transferring", 1),
+        "customer name": (sample["customer_name"], 1),
+        "call ID": (sample["call_id"], 1),
+        "RX number": (extract_rx_number(sample["voicemail_data"]), 1),
+        "prefix": ("pharm*", 1),
+        "phrase": ('"as soon as possible"', 1),
+        "deep page": ("prescription", 5_000)
+    }
+    for name, (query, page) in queries.items():
+        timings = sorted(timeit.repeat(lambda: index.search(query, page=page), number=1, repeat=repeat))
+        results = index.search(query, page=page)
+        print(f"{name:<14} {results['total']:>9,} hits  median {statistics.median(timings) * 1000:7.2f} ms  "
+              f"p95 {timings[int(len(timings) * 0.95)] * 1000:7.2f} ms")
+
+    timestamps = {call["call_id"]: call["timestamp"] for call in history}
+    for page in (1, 2):
+        hits = [timestamps[call_id] for call_id in index.search("prescription", page=page)["call_ids"]]
+        if hits != sorted(hits, reverse=True):
+            raise SystemExit(f"page {page} of hits is not newest first")
+
+
+def _regional_metrics_from_concatenation(shards):
+    # What the dashboard would do without shards: one list, one pass per metric
+    calls = [call for shard in shards.values() for call in shard.calls]
+    categories = {}
+    for call in calls:
+        categories[call["category"]] = categories.get(call["category"], 0) + 1
+    return (
+        len([c for c in calls if c["status"] == "Urgent"]),
+        len([c for c in calls if c["callback_required"]]),
+        sum(c["duration_seconds"] for c in calls),
+        categories
+    )
+
+
+def _shard_costs(shard, executor, repeat):
+    # The per-call and per-task costs behind config's SHARD_* constants.
+    # A task's overhead is a one-call shard's pool round trip minus its compute.
+    import pickle
+
+    from shards import ShardedInbox, compute_partial
+
+    def best(func, number=1):
+        return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+    columns = shard.columns()
+    pickled = pickle.dumps(columns)
+    tiny = ShardedInbox()
+    tiny.add_calls(shard.calls[:1])
+    tiny_columns = tiny.shards[shard.store_id].columns()
+    task = best(lambda: executor.submit(compute_partial, tiny_columns).result(), number=100)
+    return {
+        "compute_ns": best(lambda: compute_partial(columns)) * 1e9 / len(shard),
+        "pickle_ns": best(lambda: pickle.dumps(columns)) * 1e9 / len(shard),
+        "unpickle_ns": best(lambda: pickle.loads(pickled)) * 1e9 / len(shard),
+        "task_overhead_ms": (task - best(lambda: compute_partial(tiny_columns), number=100)) * 1e3
+    }
+
+
+def bench_shards(calls_per_store=250_000, store_counts=(1, 2, 4, 8, 12), repeat=3):
+    # Regional aggregation as stores are added: concatenating every store's
+    # calls, per-shard partials merged inline, and partials computed on a
+    # process pool with one worker per core. Calls are minimal dicts so the
+    # setup stays fast; aggregation only reads the shards' columns anyway.
+    import multiprocessing
+    import random
+    from concurrent.futures import ProcessPoolExecutor
+
+    from config import NON_URGENT_STATUSES, STORE_IDS, VOICEMAIL_TYPES
+    from shards import ShardedInbox, parallel_min_calls
+
+    statuses = ("Urgent", *NON_URGENT_STATUSES)
+    categories = [voicemail_type.replace("_", " ").title() for voicemail_type in VOICEMAIL_TYPES]
+    region = ShardedInbox()
+    workers = os.cpu_count()
+    print(f"{calls_per_store:,} calls per store, {workers} worker processes")
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+        executor.submit(int).result()
+        for stores in store_counts:
+            for store_id in STORE_IDS[len(region.shards):stores]:
+                region.add_calls({
+                    "call_id": f"{store_id}-{i}",
+                    "store_id": store_id,
+                    "status": random.choice(statuses),
+                    "category": random.choice(categories),
+                    "duration_seconds": random.randint(30, 600),
+                    "callback_required": random.random() < 0.6
+                } for i in range(calls_per_store))
+            timings = {
+                "concatenate": lambda: _regional_metrics_from_concatenation(region.shards),
+                "shards inline": lambda: region.aggregate(),
+                "shards on pool": lambda: region.aggregate(executor=executor),
+            }
+            results = "  ".join(
+                f"{name} {min(timeit.repeat(func, number=1, repeat=repeat)) * 1000:8.1f} ms"
+                for name, func in timings.items()
+            )
+            print(f"{stores:>2} stores  {results}")
+
+        # The pool's own speedup can only be timed on as many cores as this box has,
+        # so also report the costs the dashboard's threshold is modelled from
+        costs = _shard_costs(region.shards[STORE_IDS[0]], executor, repeat)
+        print("per call: compute {compute_ns:.1f} ns, pickle {pickle_ns:.1f} ns, unpickle {unpickle_ns:.1f} ns; "
+              "per task: {task_overhead_ms:.2f} ms".format(**costs))
+        for cores in sorted({2, 4, 8, 12, workers}):
+            break_even = parallel_min_calls(len(region.shards), cores, **costs)
+            pool_from = "never" if break_even == float("inf") else f"{break_even:,} calls"
+            print(f"  {len(region.shards)} stores on {cores:>2} cores: pool from {pool_from}")
+
+
+BENCHMARKS = {
+    "cold-start": bench_cold_start,
+    "generation": bench_generation,
+    "dedup": bench_dedup,
+    "replay": bench_replay,
+    "search": bench_search,
+    "shards": bench_shards,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run dashboard micro-benchmarks.")
+    parser.add_argument("benchmarks", nargs="*", help=f"Any of {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args(argv)
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+    for name in args.benchmarks or BENCHMARKS:
+        print(f"== {name}")
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
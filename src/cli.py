@@ -0,0 +1,185 @@
+import argparse
+import json
+import random
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from multiprocessing import Pool, cpu_count
+
+from generators import generate_enhanced_call_analysis, generate_sample_calls, generate_ticket
+
+# Headless batch processing of voicemails, without Streamlit:
+#
+#   python src/cli.py --generate 100000 --output results.parquet --workers 4
+#   python src/cli.py --input calls.jsonl --output results.jsonl
+#
+# Input is read and results are written one chunk at a time, and at most
+# two chunks per worker are in flight, so memory stays bounded by
+# workers * chunk size no matter how large the input is.
+
+NESTED_FIELDS = ("voicemail_data", "metadata", "analysis", "enhanced_analysis", "ticket")
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def process_call(call):
+    enhanced_analysis = generate_enhanced_call_analysis()
+    return {
+        **call,
+        "enhanced_analysis": enhanced_analysis,
+        "ticket": generate_ticket(enhanced_analysis)
+    }
+
+
+def process_chunk(task):
+    # Runs in a worker. Raw JSON lines and generated calls are both turned
+    # into output here so the parent process only moves strings to disk.
+    chunk_index, source, payload, output_format, seed = task
+    if seed is not None:
+        random.seed(seed + chunk_index)
+
+    if source == "generate":
+        calls = generate_sample_calls(payload)
+    else:
+        calls = [json.loads(line) for line in payload]
+    results = [process_call(call) for call in calls]
+
+    if output_format == "jsonl":
+        return "".join(json.dumps(r, default=_json_default) + "\n" for r in results)
+
+    # Parquet: flat columns, nested structures kept as JSON text
+    for result in results:
+        if isinstance(result["timestamp"], str):
+            result["timestamp"] = datetime.fromisoformat(result["timestamp"])
+        for field in NESTED_FIELDS:
+            if field in result:
+                result[field] = json.dumps(result[field], default=_json_default)
+    return results
+
+
+def iter_tasks(args):
+    if args.input:
+        with open(args.input, encoding="utf-8") as source:
+            chunk = []
+            for line in source:
+                if line.strip():
+                    chunk.append(line)
+                if len(chunk) == args.chunk_size:
+                    yield ("lines", chunk)
+                    chunk = []
+            if chunk:
+                yield ("lines", chunk)
+    else:
+        remaining = args.generate
+        while remaining > 0:
+            size = min(args.chunk_size, remaining)
+            yield ("generate", size)
+            remaining -= size
+
+
+class JsonlWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, chunk):
+        self.file.write(chunk)
+        return chunk.count("\n")
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    # One fixed schema for every chunk: records written before a field
+    # existed (e.g. store_id) get nulls instead of changing the file's
+    # schema, and an empty input still produces a readable file.
+
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([
+            ("call_id", pa.string()),
+            ("store_id", pa.string()),
+            ("customer_name", pa.string()),
+            ("timestamp", pa.timestamp("us")),
+            ("duration_seconds", pa.int64()),
+            ("duration_display", pa.string()),
+            ("category", pa.string()),
+            ("status", pa.string()),
+            ("callback_required", pa.bool_()),
+            ("prescriptions_discussed", pa.int64()),
+            *((field, pa.string()) for field in NESTED_FIELDS)
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, records):
+        unknown = {field for record in records for field in record} - set(self.schema.names)
+        if unknown:
+            raise ValueError(f"Fields not in the parquet output schema: {', '.join(sorted(unknown))}")
+        self.writer.write_table(self.pa.Table.from_pylist(records, schema=self.schema))
+        return len(records)
+
+    def close(self):
+        self.writer.close()
+
+
+def run(args):
+    output_format = "parquet" if args.output.endswith(".parquet") else "jsonl"
+    writer = ParquetWriter(args.output) if output_format == "parquet" else JsonlWriter(args.output)
+    tasks = (
+        (index, source, payload, output_format, args.seed)
+        for index, (source, payload) in enumerate(iter_tasks(args))
+    )
+
+    written = 0
+    started = time.perf_counter()
+    try:
+        if args.workers <= 1:
+            for task in tasks:
+                written += writer.write(process_chunk(task))
+        else:
+            with Pool(args.workers) as pool:
+                pending = deque()
+                for task in tasks:
+                    pending.append(pool.apply_async(process_chunk, (task,)))
+                    if len(pending) >= args.workers * 2:
+                        written += writer.write(pending.popleft().get())
+                while pending:
+                    written += writer.write(pending.popleft().get())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Processed {written} calls in {elapsed:.2f}s ({written / elapsed:,.0f} calls/s) -> {args.output}",
+          file=sys.stderr)
+    return written
+
+
+def _positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Process pharmacy voicemails without the dashboard.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", help="JSONL file of call records to process")
+    source.add_argument("--generate", type=int, help="Process this many generated sample calls")
+    parser.add_argument("--output", required=True, help="Results file (.jsonl or .parquet)")
+    parser.add_argument("--workers", type=int, default=cpu_count(), help="Worker processes (1 runs inline)")
+    parser.add_argument("--chunk-size", type=_positive_int, default=1000, help="Calls per worker task")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible runs")
+    run(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
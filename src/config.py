@@ -0,0 +1,305 @@
+import os
+from types import MappingProxyType
+
+# Where the call event log and its snapshots are kept
+EVENT_LOG_DIR = os.environ.get(
+    "PHARMA_EVENT_LOG_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "events")
+)
+EVENT_SNAPSHOT_EVERY = 10_000
+
+# Pharmacy locations; the inbox belongs to the first one
+STORE_IDS = tuple(f"STORE-{number:03d}" for number in range(1, 13))
+DEFAULT_STORE_ID = STORE_IDS[0]
+# What aggregating a shard costs, per `python src/benchmarks.py shards`: the
+# numpy partial, pickling a shard's columns in the server, unpickling them in
+# a worker, and one pool task's round trip. A region only goes to the process
+# pool once these say the pool beats aggregating inline on the server's cores.
+SHARD_COMPUTE_NS_PER_CALL = 14.5
+SHARD_PICKLE_NS_PER_CALL = 3.7
+SHARD_UNPICKLE_NS_PER_CALL = 1.8
+SHARD_TASK_OVERHEAD_MS = 0.43
+
+# Vocabulary and templates for the sample data generators. Built once at
+# import; tuples and read-only mappings so callers can't mutate the shared
+# tables. Voicemail templates are plain format strings and only the chosen
+# one is rendered.
+
+SUMMARY_MEDICATIONS = (
+    "blood pressure medication", "insulin", "antidepressants", "pain medication",
+    "cholesterol medication", "thyroid medication", "antibiotic prescription",
+    "asthma inhaler", "anti-anxiety medication", "heart medication"
+)
+
+SUMMARY_SITUATIONS = (
+    "running low on", "lost their", "needs clarification about dosage for",
+    "experiencing side effects from", "requesting refill for",
+    "concerned about interaction with", "needs prior authorization for",
+    "reported adverse reaction to", "seeking alternative to",
+    "cannot afford", "missed several doses of"
+)
+
+SUMMARY_URGENCY_REASONS = (
+    "due to upcoming travel plans",
+    "as current supply will run out tomorrow",
+    "due to worsening symptoms",
+    "because of insurance expiration",
+    "before leaving for vacation",
+    "after missing several doses",
+    "following doctor's new instructions",
+    "due to pharmacy closure",
+    "because of adverse reactions",
+    ""  # Empty string for cases without urgent reason
+)
+
+SUMMARY_CONTEXTS = (
+    "Insurance requires documentation.",
+    "Previous prescription shows no refills remaining.",
+    "Patient reported dizziness as side effect.",
+    "Needs copay assistance program information.",
+    "Recently switched from different medication.",
+    "Requires pharmacist consultation.",
+    "Doctor's office needs to be contacted.",
+    "Patient has questions about proper storage.",
+    "Concerned about drug interactions.",
+    "Requesting home delivery options.",
+    "Needs Spanish-speaking pharmacist.",
+    ""  # Empty string for cases without additional context
+)
+
+SUMMARY_HIGH_URGENCY_WORDS = ("tomorrow", "run out", "missing", "adverse", "worsening")
+SUMMARY_ANXIOUS_WORDS = ("concerned", "adverse", "worsening", "cannot afford")
+SUMMARY_NEUTRAL_SENTIMENTS = ("Neutral", "Calm", "Inquiring")
+
+VOICEMAIL_MEDICATIONS = (
+    "Lisinopril 10mg", "Metformin 1000mg", "Atorvastatin 40mg",
+    "Sertraline 50mg", "Levothyroxine 75mcg", "Amoxicillin 500mg",
+    "Omeprazole 20mg", "Gabapentin 300mg", "Hydrochlorothiazide 25mg"
+)
+
+# Voicemail type -> message templates ({name}, {rx}, {medication}, {phone})
+VOICEMAIL_SCENARIOS = MappingProxyType({
+    "refill_request": (
+        "Hi, this is {name} calling about my prescription {rx} for {medication}. "
+        "I'm running low and need a refill. My number is {phone}. "
+        "Please call me back to let me know when it will be ready.",
+
+        "Hello, {name} here. I need to refill my {medication}, "
+        "prescription number {rx}. I'm down to my last few pills. "
+        "You can reach me at {phone}. Thank you.",
+    ),
+    "urgent_request": (
+        "This is {name} and I urgently need my {medication}. "
+        "I'm completely out and it's prescription {rx}. "
+        "Please call me as soon as possible at {phone}. "
+        "This is really important.",
+
+        "Hello, {name} calling. I have an emergency with my prescription {rx}. "
+        "I lost my medication bottle of {medication} while traveling. "
+        "Please call me back immediately at {phone}. "
+        "I need this medication daily.",
+    ),
+    "insurance_query": (
+        "Hi, this is {name}. I'm calling about a problem with my insurance coverage "
+        "for prescription {rx}. They're saying it needs prior authorization. "
+        "Please call me back at {phone} to discuss this.",
+
+        "Hello, {name} here. I got a message saying there's an insurance issue "
+        "with my {medication}. My number is {phone}. "
+        "I need to know what I need to do to get this resolved.",
+    ),
+    "side_effect_concern": (
+        "This is {name} calling about my prescription {rx} for {medication}. "
+        "I'm experiencing some side effects and need to speak with a pharmacist. "
+        "My callback number is {phone}.",
+
+        "Hi, {name} here. I've been having some reactions to my new prescription "
+        "{rx} and need to discuss this with someone. Please call me at "
+        "{phone}. I'm concerned about continuing the medication.",
+    ),
+    "transfer_request": (
+        "Hello, this is {name}. I need to transfer my prescriptions from another pharmacy. "
+        "I have about 5 medications including {medication}. "
+        "Please call me back at {phone} to help with this process.",
+
+        "Hi, {name} calling about transferring my medications to your pharmacy. "
+        "My current prescription number is {rx}. You can reach me at {phone}. "
+        "I'd like to get this started as soon as possible.",
+    ),
+    "cost_concern": (
+        "Hi, this is {name} calling about the cost of my prescription {rx}. "
+        "The price seems much higher than usual for my {medication}. "
+        "Please call me back at {phone} to discuss any discount options.",
+
+        "Hello, {name} here. I'm having trouble affording my prescription and "
+        "wanted to know if there are any cheaper alternatives or discount programs available. "
+        "My number is {phone}.",
+    ),
+})
+VOICEMAIL_TYPES = tuple(VOICEMAIL_SCENARIOS)
+
+VOICEMAIL_ENDINGS = (
+    " Thanks for your help.",
+    " Please call me back when you can.",
+    " I appreciate your help with this.",
+    " Looking forward to hearing back from you.",
+    " Please let me know as soon as possible."
+)
+
+VOICEMAIL_CALL_TIMES = (
+    "I'm available anytime today.",
+    "Best time to reach me is in the afternoon.",
+    "Please call before 5pm if possible.",
+    "I'm available between 9am and 6pm.",
+    "You can call me back anytime.",
+    ""  # Empty string for cases where no time preference is given
+)
+
+CALL_BACK_PREFERENCES = ("Morning", "Afternoon", "Evening", "ASAP", "Any time")
+
+CUSTOMERS = (
+    "Sarah Johnson", "Mike Smith", "Emily Brown", "James Wilson",
+    "Maria Garcia", "David Lee", "Lisa Anderson", "Robert Taylor",
+    "Jennifer Martinez", "William Davis", "Emma Thompson", "John Carter",
+    "Patricia Rodriguez", "Michael Chang", "Susan Miller"
+)
+
+NON_URGENT_STATUSES = ("New", "Pending", "In Progress")
+
+SIMILAR_CASE_RESOLUTIONS = (
+    "Processed emergency refill and contacted doctor",
+    "Provided copay assistance information",
+    "Scheduled pharmacist consultation",
+    "Transferred prescription to new location",
+    "Contacted insurance for prior authorization",
+    "Applied discount card to reduce cost",
+    "Documented side effects and notified doctor",
+    "Arranged home delivery service",
+    "Provided medication interaction review",
+    "Completed insurance override request"
+)
+
+KEY_PHRASES = (
+    "medication shortage", "insurance coverage", "side effects", "urgent refill",
+    "prior authorization", "drug interaction", "vacation override", "lost medication",
+    "dosing schedule", "adverse reaction", "insurance denial", "travel emergency",
+    "copay assistance", "pharmacy transfer", "home delivery", "consultation required",
+    "doctor notification", "prescription expired", "language assistance", "payment plan"
+)
+# Phrase -> its words, split once instead of on every summary
+KEY_PHRASE_WORDS = MappingProxyType({phrase: tuple(phrase.split()) for phrase in KEY_PHRASES})
+
+TRANSCRIPT_MEDICATIONS = ("Amoxicillin 500mg", "Lisinopril 10mg", "Metformin 1000mg", "Sertraline 50mg", "Omeprazole 20mg")
+
+DEPARTMENTS = ("Pharmacy", "Insurance", "Medical Review", "Customer Service", "Clinical Support")
+PRIORITIES = ("High", "Medium", "Low")
+TICKET_TYPES = ("Medication Issue", "Insurance Claim", "Prescription Renewal", "Side Effect Report", "Drug Interaction")
+SLA_HOURS = (2, 4, 8, 24, 48)
+TICKET_TAGS = ("#urgent", "#callback", "#prescription", "#insurance", "#review", "#followup")
+
+INTENT_KEYWORDS = MappingProxyType({
+    "Urgent Refill Request": ("today", "running low", "need", "refill", "emergency", "urgent", "out of"),
+    "General Refill": ("refill", "prescription", "medication", "renew"),
+    "Side Effect Report": ("side effect", "reaction", "feeling", "dizzy", "sick", "pain"),
+    "Insurance Query": ("insurance", "coverage", "cost", "pay", "price"),
+    "Drug Information": ("information", "how to", "when", "effects", "instructions"),
+    "Prescription Transfer": ("transfer", "move", "different", "another", "pharmacy"),
+    "Medication Inquiry": ("about", "question", "ask", "explain", "understand"),
+})
+
+PRIMARY_EMOTIONS = (
+    "Anxious", "Frustrated", "Satisfied", "Confused",
+    "Urgent", "Neutral", "Concerned", "Appreciative"
+)
+SECONDARY_EMOTIONS = (
+    "Worried about cost", "Uncertain about instructions",
+    "Relieved about solution", "Stressed about timeline",
+    "Grateful for help", "Confused about process"
+)
+EMOTION_TRIGGERS = (
+    "medication cost", "insurance coverage",
+    "side effects", "waiting time",
+    "prescription availability", "doctor approval"
+)
+
+RISK_LEVELS = ("Low", "Medium", "High")
+RISK_FACTORS = (
+    "Missed doses", "Drug interaction potential",
+    "Side effect concerns", "Delayed refill",
+    "Insurance expiration", "Multiple pharmacy usage"
+)
+ADHERENCE_PATTERNS = (
+    "Regular refills", "Occasional delays",
+    "Frequent missed doses", "Inconsistent pickup"
+)
+
+ACTION_ITEMS = (
+    MappingProxyType({
+        "action": "Schedule follow-up call",
+        "priority": "High",
+        "deadline": "24 hours",
+        "reason": "Discuss side effects"
+    }),
+    MappingProxyType({
+        "action": "Contact prescribing physician",
+        "priority": "Medium",
+        "deadline": "48 hours",
+        "reason": "Verify dosage change"
+    }),
+    MappingProxyType({
+        "action": "Process prior authorization",
+        "priority": "High",
+        "deadline": "24 hours",
+        "reason": "Insurance requirement"
+    }),
+    MappingProxyType({
+        "action": "Update patient profile",
+        "priority": "Low",
+        "deadline": "72 hours",
+        "reason": "New contact information"
+    }),
+    MappingProxyType({
+        "action": "Schedule medication review",
+        "priority": "Medium",
+        "deadline": "48 hours",
+        "reason": "Multiple medication interactions"
+    })
+)
+
+TOPICS = (
+    "Prescription Renewal", "Insurance Coverage",
+    "Side Effects", "Drug Interactions",
+    "Payment Concerns", "Delivery Options",
+    "Dosage Instructions", "Generic Alternatives",
+    "Prior Authorization", "Pharmacy Transfer"
+)
+
+COMMON_ISSUES = (
+    "Regular early refill requests",
+    "Frequent insurance queries",
+    "Multiple medication adjustments",
+    "Consistent payment concerns",
+    "Regular side effect reports"
+)
+PATIENT_PROFILE_FLAGS = (
+    "Chronic condition",
+    "Multiple prescribers",
+    "Complex medication regimen",
+    "Special handling required",
+    "Preferred language support"
+)
+
+IMMEDIATE_ACTIONS = (
+    "Process emergency refill",
+    "Schedule pharmacist consultation",
+    "Contact prescribing physician",
+    "Update insurance information",
+    "Document reported side effects"
+)
+LONG_TERM_SUGGESTIONS = (
+    "Enroll in auto-refill program",
+    "Schedule regular medication review",
+    "Consider medication synchronization",
+    "Recommend patient assistance program",
+    "Set up medication reminders"
+)
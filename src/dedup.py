@@ -0,0 +1,195 @@
+import re
+import zlib
+
+import numpy as np
+
+# MinHash / LSH parameters. 16 bands of 4 rows puts the LSH candidate
+# threshold at roughly (1/16) ** (1/4) ~= 0.5, below the verification cutoff.
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = MINHASH_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 3
+SIMILARITY_THRESHOLD = 0.7
+
+# Hash family h(x) = (a * x + b) mod p with p = 2^31 - 1 keeps every product
+# below 2^62, so the whole signature fits in uint64 arithmetic.
+_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.default_rng(20241)
+_A = _rng.integers(1, int(_PRIME), size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), size=MINHASH_PERMUTATIONS, dtype=np.uint64)
+_SHINGLE_BASE = np.uint64(1_000_003)
+_BAND_WEIGHTS = _rng.integers(1, 1 << 63, size=LSH_ROWS, dtype=np.uint64)
+
+_RX_PATTERN = re.compile(r"\bRX\d{6}\b", re.IGNORECASE)
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_word_hashes = {}
+
+
+def normalize_phone(number):
+    digits = "".join(ch for ch in number or "" if ch.isdigit())
+    # Drop the US country code so "+1 (555) ..." and "(555) ..." collide
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits if len(digits) >= 10 else None
+
+
+def normalize_name(name):
+    return " ".join(_WORD_PATTERN.findall((name or "").lower())) or None
+
+
+def extract_rx_number(voicemail):
+    if voicemail.get("prescription_mentioned"):
+        return voicemail["prescription_mentioned"].upper()
+    match = _RX_PATTERN.search(voicemail.get("message", ""))
+    return match.group(0).upper() if match else None
+
+
+def _word_hash(word):
+    value = _word_hashes.get(word)
+    if value is None:
+        value = _word_hashes[word] = zlib.crc32(word.encode("utf-8")) % int(_PRIME)
+    return value
+
+
+def _signature_batch(texts):
+    # Every message is tokenized into one flat array of word hashes (padded to
+    # at least SHINGLE_SIZE words) and its word shingles are hashed in place,
+    # so the permutations for the whole batch are a single (P x shingles)
+    # matrix reduced per message with np.minimum.reduceat.
+    tokens = []
+    lengths = []
+    for text in texts:
+        words = [_word_hash(w) for w in _WORD_PATTERN.findall(text.lower())]
+        words.extend([0] * (SHINGLE_SIZE - len(words)))
+        tokens.extend(words)
+        lengths.append(len(words))
+
+    tokens = np.asarray(tokens, dtype=np.uint64)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    message_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    shingle_counts = lengths - SHINGLE_SIZE + 1
+    shingle_offsets = np.concatenate(([0], np.cumsum(shingle_counts)[:-1]))
+    positions = (np.arange(shingle_counts.sum())
+                 - np.repeat(shingle_offsets, shingle_counts)
+                 + np.repeat(message_starts, shingle_counts))
+
+    shingle_hashes = np.zeros(positions.size, dtype=np.uint64)
+    for k in range(SHINGLE_SIZE):
+        shingle_hashes = (shingle_hashes * _SHINGLE_BASE + tokens[positions + k]) % _PRIME
+
+    permuted = (_A[:, None] * shingle_hashes[None, :] + _B[:, None]) % _PRIME
+    return np.minimum.reduceat(permuted, shingle_offsets, axis=1).T
+
+
+def minhash_signatures(texts, batch_size=1024):
+    signatures = np.empty((len(texts), MINHASH_PERMUTATIONS), dtype=np.uint64)
+    for start in range(0, len(texts), batch_size):
+        signatures[start:start + batch_size] = _signature_batch(texts[start:start + batch_size])
+    return signatures
+
+
+def minhash_signature(text):
+    return minhash_signatures([text])[0]
+
+
+def estimated_similarity(sig_a, sig_b):
+    return float(np.count_nonzero(sig_a == sig_b)) / MINHASH_PERMUTATIONS
+
+
+class _DisjointSet:
+    # Each set remembers the one RX number its calls are about and the
+    # callback numbers they left. A union that would put two different RX
+    # numbers in one thread is refused, and so is a similarity union between
+    # groups that both left callback numbers but share none.
+
+    def __init__(self, rx_numbers, phones):
+        self.parent = list(range(len(rx_numbers)))
+        self.rx_numbers = list(rx_numbers)
+        self.phones = [{phone} if phone else set() for phone in phones]
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i, j, same_phone=False):
+        # Returns whether i and j end up in the same set
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return True
+        rx_i, rx_j = self.rx_numbers[root_i], self.rx_numbers[root_j]
+        if rx_i and rx_j and rx_i != rx_j:
+            return False
+        phones_i, phones_j = self.phones[root_i], self.phones[root_j]
+        if same_phone and phones_i and phones_j and phones_i.isdisjoint(phones_j):
+            return False
+        root, child = min(root_i, root_j), max(root_i, root_j)
+        self.parent[child] = root
+        self.rx_numbers[root] = rx_i or rx_j
+        self.phones[root] = phones_i | phones_j
+        self.phones[child] = set()
+        return True
+
+
+def group_calls(calls, threshold=SIMILARITY_THRESHOLD):
+    # Cluster voicemails that are about the same request into threads.
+    #
+    # Exact keys (callback number, customer + RX number) are bucketed in a
+    # dict, and every call is unioned with the first call in its bucket it
+    # can join; a call no member will take (a different RX number) becomes
+    # another member, so later calls about its RX still find it.
+    # Near-duplicate messages are found with MinHash LSH: each band of the
+    # signature is hashed together with the customer name, and a call is
+    # verified only against the first call of each bucket it lands in, so
+    # the whole pass stays O(n * bands) instead of comparing every pair.
+    # No thread ever mixes two RX numbers, and similar wording alone never
+    # joins groups that left different callback numbers.
+    rx_numbers = [extract_rx_number(c["voicemail_data"]) for c in calls]
+    phones = [normalize_phone(c["voicemail_data"].get("callback_number")) for c in calls]
+    members = _DisjointSet(rx_numbers, phones)
+    buckets = {}
+    first_seen = {}
+    signatures = minhash_signatures([c["voicemail_data"].get("message", "") for c in calls])
+    # Collapse each band's rows into one integer key (wrapping uint64 sum);
+    # accidental collisions are harmless because candidates are verified.
+    band_keys = (signatures.reshape(len(calls), LSH_BANDS, LSH_ROWS) * _BAND_WEIGHTS).sum(axis=2).tolist()
+
+    for i, call in enumerate(calls):
+        name = normalize_name(call["customer_name"])
+        phone = phones[i]
+        rx_number = rx_numbers[i]
+
+        keys = []
+        if phone:
+            keys.append(("phone", phone))
+        if name and rx_number:
+            keys.append(("rx", name, rx_number))
+        for key in keys:
+            bucket = buckets.setdefault(key, [])
+            if not any(members.union(i, j) for j in bucket):
+                bucket.append(i)
+
+        for band, band_key in enumerate(band_keys[i]):
+            j = first_seen.setdefault((name, band, band_key), i)
+            if j != i and estimated_similarity(signatures[i], signatures[j]) >= threshold:
+                members.union(i, j, same_phone=True)
+
+    grouped = {}
+    for i, call in enumerate(calls):
+        grouped.setdefault(members.find(i), []).append(call)
+
+    threads = []
+    for thread_calls in grouped.values():
+        thread_calls.sort(key=lambda c: c["timestamp"], reverse=True)
+        threads.append({
+            "thread_id": f"THREAD-{thread_calls[-1]['call_id']}",
+            "calls": thread_calls,
+            "latest": thread_calls[0],
+            "size": len(thread_calls),
+            "urgent": any(c["voicemail_data"]["urgent"] for c in thread_calls)
+        })
+
+    threads.sort(key=lambda t: t["latest"]["timestamp"], reverse=True)
+    return threads
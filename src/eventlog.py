@@ -0,0 +1,183 @@
+import copy
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+from datetime import datetime
+
+# Append-only log of call lifecycle events.
+#
+# Every event is one frame: a 4-byte little-endian payload length followed
+# by the compact JSON payload. Frames are only ever appended; a torn frame
+# left at the tail by a crash is ignored and truncated on the next open.
+# Every `snapshot_every` events the reduced state is written to
+# snapshot-<offset>.json together with the log offset it covers, so
+# reopening replays only the frames after the newest snapshot, read
+# through a read-only mmap of the log.
+
+EVENT_TYPES = ("ingested", "backfilled", "analyzed", "ticketed", "status_changed", "called_back")
+
+_FRAME_HEADER = struct.Struct("<I")
+_SNAPSHOT_PATTERN = "snapshot-*.json"
+_REPLAY_BATCH = 10_000
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def new_state():
+    return {
+        "calls": {},
+        "batch": None,
+        "inbox": [],
+        "sources": {},
+        "thread_analyses": {},
+        "thread_tickets": {}
+    }
+
+
+def validate_event(state, event):
+    # Checked before an event is written, so the log never holds a frame the
+    # reducer can't apply
+    kind = event["type"]
+    if kind not in EVENT_TYPES:
+        raise ValueError(f"Unknown event type: {kind}")
+    if kind in ("ingested", "backfilled"):
+        if event["call_id"] in state["calls"]:
+            raise ValueError(f"Call already ingested: {event['call_id']}")
+    elif kind in ("status_changed", "called_back"):
+        if event["call_id"] not in state["calls"]:
+            raise KeyError(f"Unknown call: {event['call_id']}")
+
+
+def apply_event(state, event):
+    kind = event["type"]
+    if kind in ("status_changed", "called_back") and event["call_id"] not in state["calls"]:
+        # Logs written before events were validated may reference unknown calls
+        return
+    if kind == "ingested":
+        # Calls ingested together form a batch; the newest batch is the inbox
+        if event["batch"] != state["batch"]:
+            state["batch"] = event["batch"]
+            state["inbox"] = []
+        state["calls"][event["call_id"]] = event["call"]
+        state["inbox"].append(event["call_id"])
+    elif kind == "backfilled":
+        # Calls loaded outside the inbox (sample history, other stores), kept with
+        # where they came from; snapshots written before backfills lack the key
+        state["calls"][event["call_id"]] = event["call"]
+        state.setdefault("sources", {})[event["call_id"]] = event["source"]
+    elif kind == "analyzed":
+        state["thread_analyses"][event["thread_id"]] = event["analysis"]
+    elif kind == "ticketed":
+        state["thread_tickets"][event["thread_id"]] = event["ticket"]
+    elif kind == "status_changed":
+        state["calls"][event["call_id"]]["status"] = event["status"]
+    elif kind == "called_back":
+        state["calls"][event["call_id"]]["callback_required"] = False
+    else:
+        raise ValueError(f"Unknown event type: {kind}")
+
+
+def restore_call(call):
+    # Calls are stored as JSON; hand the dashboard a private copy with datetimes back
+    call = copy.deepcopy(call)
+    call["timestamp"] = datetime.fromisoformat(call["timestamp"])
+    call["voicemail_data"]["timestamp"] = datetime.fromisoformat(call["voicemail_data"]["timestamp"])
+    return call
+
+
+class EventLog:
+    def __init__(self, directory, snapshot_every=10_000):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.path = os.path.join(directory, "events.log")
+        self.snapshot_every = snapshot_every
+        self.lock = threading.Lock()
+
+        self.state, self.offset = self._load_snapshot()
+        self.replayed = self._replay()
+        self.events_since_snapshot = self.replayed
+        self.file = open(self.path, "ab")
+
+    def _snapshots(self):
+        return sorted(glob.glob(os.path.join(self.directory, _SNAPSHOT_PATTERN)))
+
+    def _load_snapshot(self):
+        snapshots = self._snapshots()
+        if not snapshots:
+            return new_state(), 0
+        with open(snapshots[-1], encoding="utf-8") as f:
+            snapshot = json.load(f)
+        return snapshot["state"], snapshot["offset"]
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return 0
+        replayed = 0
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > self.offset:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    position = self.offset
+                    payloads = []
+                    while position + _FRAME_HEADER.size <= size:
+                        (length,) = _FRAME_HEADER.unpack_from(view, position)
+                        start = position + _FRAME_HEADER.size
+                        if start + length > size:
+                            break
+                        payloads.append(view[start:start + length])
+                        position = start + length
+                        if len(payloads) == _REPLAY_BATCH:
+                            replayed += self._apply_payloads(payloads)
+                            payloads = []
+                    replayed += self._apply_payloads(payloads)
+                self.offset = position
+        if size > self.offset:
+            # Drop a frame that was only partially written before a crash
+            os.truncate(self.path, self.offset)
+        return replayed
+
+    def _apply_payloads(self, payloads):
+        # Parse a whole batch of frames as one JSON array: one call into the
+        # C decoder instead of one json.loads per event
+        for event in json.loads(b"[" + b",".join(payloads) + b"]"):
+            apply_event(self.state, event)
+        return len(payloads)
+
+    def append(self, event_type, call_id, **data):
+        event = {"type": event_type, "call_id": call_id, "at": datetime.now().isoformat(), **data}
+        payload = json.dumps(event, default=_json_default, separators=(",", ":")).encode("utf-8")
+        # Apply the decoded payload so live state matches what a replay builds
+        event = json.loads(payload)
+        with self.lock:
+            validate_event(self.state, event)
+            self.file.write(_FRAME_HEADER.pack(len(payload)) + payload)
+            self.file.flush()
+            self.offset += _FRAME_HEADER.size + len(payload)
+            apply_event(self.state, event)
+            self.events_since_snapshot += 1
+            if self.events_since_snapshot >= self.snapshot_every:
+                self._write_snapshot()
+
+    def snapshot(self):
+        with self.lock:
+            self._write_snapshot()
+
+    def _write_snapshot(self):
+        path = os.path.join(self.directory, f"snapshot-{self.offset:016d}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"offset": self.offset, "state": self.state}, f, separators=(",", ":"))
+        os.replace(path + ".tmp", path)
+        for old in self._snapshots():
+            if old != path:
+                os.remove(old)
+        self.events_since_snapshot = 0
+
+    def close(self):
+        self.file.close()
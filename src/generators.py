@@ -0,0 +1,302 @@
+from datetime import datetime, timedelta
+import random
+
+from config import (ACTION_ITEMS, ADHERENCE_PATTERNS, CALL_BACK_PREFERENCES, COMMON_ISSUES, CUSTOMERS,
+                    DEFAULT_STORE_ID, DEPARTMENTS, EMOTION_TRIGGERS, IMMEDIATE_ACTIONS, INTENT_KEYWORDS,
+                    KEY_PHRASE_WORDS, KEY_PHRASES, LONG_TERM_SUGGESTIONS, NON_URGENT_STATUSES,
+                    PATIENT_PROFILE_FLAGS, PRIMARY_EMOTIONS, PRIORITIES, RISK_FACTORS, RISK_LEVELS,
+                    SECONDARY_EMOTIONS, SIMILAR_CASE_RESOLUTIONS, SLA_HOURS, SUMMARY_ANXIOUS_WORDS,
+                    SUMMARY_CONTEXTS, SUMMARY_HIGH_URGENCY_WORDS, SUMMARY_MEDICATIONS,
+                    SUMMARY_NEUTRAL_SENTIMENTS, SUMMARY_SITUATIONS, SUMMARY_URGENCY_REASONS, TICKET_TAGS,
+                    TICKET_TYPES, TOPICS, TRANSCRIPT_MEDICATIONS, VOICEMAIL_CALL_TIMES, VOICEMAIL_ENDINGS,
+                    VOICEMAIL_MEDICATIONS, VOICEMAIL_SCENARIOS, VOICEMAIL_TYPES)
+
+
+def generate_varied_summary():
+    # Generate the main situation
+    main_situation = f"Patient {random.choice(SUMMARY_SITUATIONS)} {random.choice(SUMMARY_MEDICATIONS)}"
+    
+    # Maybe add urgency reason
+    if random.random() > 0.3:  # 70% chance to add urgency reason
+        urgency = random.choice(SUMMARY_URGENCY_REASONS)
+        if urgency:
+            main_situation += f" {urgency}"
+    
+    # Maybe add context
+    if random.random() > 0.5:  # 50% chance to add context
+        context = random.choice(SUMMARY_CONTEXTS)
+        if context:
+            main_situation += f" {context}"
+
+    # Determine intent and urgency based on content
+    situation = main_situation.lower()
+    if any(word in situation for word in SUMMARY_HIGH_URGENCY_WORDS):
+        urgency = "High"
+        intent = "Urgent Refill Request"
+    elif "side effect" in situation or "adverse" in situation:
+        urgency = "Medium"
+        intent = "Side Effect Report"
+    elif "insurance" in situation or "afford" in situation:
+        urgency = "Medium"
+        intent = "Insurance Query"
+    else:
+        urgency = "Low"
+        intent = "General Inquiry"
+
+    # Determine sentiment based on content
+    if any(word in situation for word in SUMMARY_ANXIOUS_WORDS):
+        sentiment = "Anxious"
+    elif "urgency" in situation or "tomorrow" in situation:
+        sentiment = "Urgent"
+    else:
+        sentiment = random.choice(SUMMARY_NEUTRAL_SENTIMENTS)
+
+    return {
+        "summary": main_situation,
+        "intent": intent,
+        "urgency": urgency,
+        "sentiment": sentiment
+    }
+
+def generate_voicemail_message(customer_name):
+    # Common voicemail components
+    rx_number = f"RX{random.randint(100000, 999999)}"
+    callback_numbers = [
+        f"({random.randint(200,999)}) {random.randint(200,999)}-{random.randint(1000,9999)}"
+        for _ in range(3)
+    ]
+    
+    # Select a random scenario and render only its chosen template
+    voicemail_type = random.choice(VOICEMAIL_TYPES)
+    message = random.choice(VOICEMAIL_SCENARIOS[voicemail_type]).format(
+        name=customer_name,
+        rx=rx_number,
+        medication=random.choice(VOICEMAIL_MEDICATIONS),
+        phone=random.choice(callback_numbers)
+    )
+    
+    # Add common voicemail endings
+    message += random.choice(VOICEMAIL_ENDINGS)
+    if random.random() > 0.5:  # 50% chance to add time preference
+        message += " " + random.choice(VOICEMAIL_CALL_TIMES)
+
+    return {
+        "voicemail_type": voicemail_type,
+        "message": message,
+        "timestamp": datetime.now() - timedelta(minutes=random.randint(5, 120)),
+        "duration": f"{random.randint(20, 90)} seconds",
+        "callback_number": random.choice(callback_numbers),
+        "prescription_mentioned": rx_number if "rx_number" in message else None,
+        "urgent": voicemail_type == "urgent_request",
+        "requires_pharmacist": voicemail_type in ("side_effect_concern", "urgent_request"),
+        "call_back_preference": random.choice(CALL_BACK_PREFERENCES),
+        "auto_transcription_confidence": random.randint(85, 99)
+    }
+
+def generate_call_analysis():
+    scenario = generate_varied_summary()
+    similar_cases = [
+        {
+            "case_id": f"CASE-{random.randint(1000, 9999)}",
+            "similarity": random.randint(75, 95),
+            "resolution": random.choice(SIMILAR_CASE_RESOLUTIONS)
+        }
+        for _ in range(random.randint(2, 4))
+    ]
+    
+    # Select phrases that are relevant to the summary
+    summary = scenario["summary"].lower()
+    relevant_phrases = [phrase for phrase in KEY_PHRASES
+                       if any(word in summary for word in KEY_PHRASE_WORDS[phrase])]
+    
+    # Add some random phrases if we don't have enough relevant ones
+    if len(relevant_phrases) < 3:
+        additional_phrases = random.sample([p for p in KEY_PHRASES if p not in relevant_phrases],
+                                        k=min(3, len(KEY_PHRASES) - len(relevant_phrases)))
+        relevant_phrases.extend(additional_phrases)
+    
+    return {
+        "call_summary": scenario["summary"],
+        "primary_intent": scenario["intent"],
+        "confidence_score": random.randint(85, 99),
+        "urgency_level": scenario["urgency"],
+        "sentiment": scenario["sentiment"],
+        "similar_cases": similar_cases,
+        "key_phrases": random.sample(relevant_phrases, k=min(len(relevant_phrases), 4))
+    }
+
+
+
+def generate_sample_transcript(customer_name):
+    rx_number = f"RX{random.randint(100000, 999999)}"
+    selected_med = random.choice(TRANSCRIPT_MEDICATIONS)
+    
+    return {
+        "automated_system": "Thank you for calling CVS Pharmacy. For prescription refills, press 1. Para español, presione 2.",
+        "customer": f"Hi, this is {customer_name}. I need to refill my prescription {rx_number}.",
+        "pharmacist": f"Hello {customer_name}, I can help you with that. I see your prescription for {selected_med}. When would you like to pick this up?",
+        "customer_response": "Can I get it today? I'm running low on my medication.",
+        "pharmacist_closing": f"Yes, I can have that ready in about 2 hours. We'll send you a text message when it's ready. Is there anything else I can help you with?",
+        "customer_closing": "No, that's all. Thank you for your help!"
+    }
+
+def generate_call_metadata():
+    return {
+        "ticket_id": f"TKT-{random.randint(10000, 99999)}",
+        "department": random.choice(DEPARTMENTS),
+        "priority": random.choice(PRIORITIES),
+        "ticket_type": random.choice(TICKET_TYPES),
+        "assigned_to": f"Agent-{random.randint(100, 999)}",
+        "sla_hours": random.choice(SLA_HOURS),
+        "tags": random.sample(TICKET_TAGS, k=random.randint(2, 4))
+    }
+
+
+
+def analyze_intent(transcript):
+    # Extract conversation text
+    customer_text = transcript['customer'] + " " + transcript['customer_response']
+    
+    # Keywords for different intents
+    intent_keywords = INTENT_KEYWORDS
+
+def generate_enhanced_call_analysis():
+    # Generate more detailed sentiment analysis
+    sentiment_analysis = {
+        "primary_emotion": random.choice(PRIMARY_EMOTIONS),
+        "secondary_emotions": random.sample(SECONDARY_EMOTIONS, k=2),
+        "confidence_score": random.randint(85, 99),
+        "emotion_triggers": random.sample(EMOTION_TRIGGERS, k=2)
+    }
+
+    # Generate compliance and risk indicators
+    risk_assessment = {
+        "risk_level": random.choice(RISK_LEVELS),
+        "risk_factors": random.sample(RISK_FACTORS, k=random.randint(1, 3)),
+        "compliance_score": random.randint(60, 100),
+        "adherence_patterns": random.choice(ADHERENCE_PATTERNS)
+    }
+
+    # Generate action items and recommendations (copied out of the shared read-only table)
+    action_items = [dict(item) for item in random.sample(ACTION_ITEMS, k=random.randint(1, 3))]
+
+    # Generate regulatory compliance check
+    compliance_check = {
+        "hipaa_compliant": True,
+        "phi_disclosed": random.choice((True, False)),
+        "required_disclaimers_given": random.choice((True, False)),
+        "consent_verified": random.choice((True, False)),
+        "documentation_complete": random.choice((True, False))
+    }
+
+    # Generate call quality metrics
+    call_quality = {
+        "clarity_score": random.randint(80, 100),
+        "resolution_completeness": random.randint(70, 100),
+        "customer_satisfaction_predicted": random.randint(60, 100),
+        "follow_up_needed": random.choice((True, False)),
+        "escalation_required": random.choice((True, False))
+    }
+
+    # Generate key topics and themes
+    topics_identified = random.sample(TOPICS, k=random.randint(2, 4))
+
+    # Generate historical context analysis
+    historical_context = {
+        "previous_interactions": random.randint(0, 5),
+        "common_issues": random.sample(COMMON_ISSUES, k=random.randint(1, 2)),
+        "patient_profile_flags": random.sample(PATIENT_PROFILE_FLAGS, k=random.randint(1, 2))
+    }
+
+    # Generate AI recommendations
+    ai_recommendations = {
+        "immediate_actions": random.sample(IMMEDIATE_ACTIONS, k=random.randint(1, 2)),
+        "long_term_suggestions": random.sample(LONG_TERM_SUGGESTIONS, k=random.randint(1, 2))
+    }
+
+    return {
+        "sentiment_analysis": sentiment_analysis,
+        "risk_assessment": risk_assessment,
+        "action_items": action_items,
+        "compliance_check": compliance_check,
+        "call_quality": call_quality,
+        "topics_identified": topics_identified,
+        "historical_context": historical_context,
+        "ai_recommendations": ai_recommendations,
+        "analysis_timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "analysis_version": "2.0.0"
+    }
+
+def generate_sample_calls(n_calls=10, store_id=DEFAULT_STORE_ID):
+    calls = []
+    for _ in range(n_calls):
+        customer_name = random.choice(CUSTOMERS)
+        voicemail = generate_voicemail_message(customer_name)
+        analysis = generate_enhanced_call_analysis()
+        
+        # Extract just the number from the duration string (e.g., "45 seconds" -> 45)
+        duration_seconds = int(voicemail["duration"].split()[0])
+        
+        call = {
+            # 64 random bits: unique across batches and CLI workers, and still reproducible under --seed
+            "call_id": f"CALL-{random.getrandbits(64):016X}",
+            "store_id": store_id,
+            "customer_name": customer_name,
+            "timestamp": voicemail["timestamp"],
+            "duration_seconds": duration_seconds,  # Store the duration in seconds
+            "duration_display": voicemail["duration"],  # Store the display format
+            "category": voicemail["voicemail_type"].replace("_", " ").title(),
+            "status": "Urgent" if voicemail["urgent"] else random.choice(NON_URGENT_STATUSES),
+            "callback_required": True,  # All voicemails require callbacks
+            "prescriptions_discussed": 1 if voicemail["prescription_mentioned"] else 0,
+            "voicemail_data": voicemail,
+            "metadata": generate_call_metadata(),
+            "analysis": analysis
+        }
+        calls.append(call)
+    
+    return calls
+
+def generate_history_calls(days=365, calls_per_day=50):
+    # Backfill sample history by spreading freshly generated calls over past days
+    now = datetime.now()
+    calls = []
+    for day in range(1, days + 1):
+        for call in generate_sample_calls(calls_per_day):
+            timestamp = now - timedelta(days=day, minutes=random.randint(0, 24 * 60 - 1))
+            call["timestamp"] = timestamp
+            call["voicemail_data"]["timestamp"] = timestamp
+            calls.append(call)
+    return calls
+
+def generate_ticket(enhanced_analysis):
+    return {
+        "ticket_id": f"TKT-{datetime.now().strftime('%Y%m%d')}-{random.randint(1000,9999)}",
+        "created": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        "status": "Active",
+        "priority": enhanced_analysis['risk_assessment']['risk_level'],
+        "risk_level": enhanced_analysis['risk_assessment']['risk_level'],
+        "required_actions": len(enhanced_analysis['action_items']),
+        "compliance_score": enhanced_analysis['risk_assessment']['compliance_score'],
+        "follow_up_required": enhanced_analysis['call_quality']['follow_up_needed'],
+        "primary_concerns": enhanced_analysis['topics_identified'],
+        "immediate_actions": enhanced_analysis['ai_recommendations']['immediate_actions']
+    }
+
+def format_ticket(ticket):
+    return f"""
+Ticket ID: {ticket['ticket_id']}
+Created: {ticket['created']}
+Status: {ticket['status']}
+Priority: {ticket['priority']}
+Risk Level: {ticket['risk_level']}
+Required Actions: {ticket['required_actions']}
+Compliance Score: {ticket['compliance_score']}%
+Follow-up Required: {"Yes" if ticket['follow_up_required'] else "No"}
+
+Primary Concerns:
+{chr(10).join(f"- {topic}" for topic in ticket['primary_concerns'])}
+
+Immediate Actions Required:
+{chr(10).join(f"- {action}" for action in ticket['immediate_actions'])}
+        """
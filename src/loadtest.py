@@ -0,0 +1,266 @@
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+# Load test for the dashboard: N concurrent staff sessions against a real
+# `streamlit run` server, as session count and inbox size grow.
+#
+#   python src/loadtest.py --sessions 1 5 10 20 --inbox-sizes 10 100 1000
+#
+# Every (sessions, inbox size) point starts a fresh headless server whose
+# event log is seeded with an inbox of that size. Sessions talk to it the
+# way the browser does: a websocket per session, BackMsg rerun requests
+# carrying widget states, ForwardMsg deltas back until the script run
+# finishes. Each session scripts what a staff member does: load the
+# inbox, search, open the filters, Analyze a thread (the ~5s analysis
+# included), Generate Ticket and reload the page. Rerun latency is the
+# time from sending a rerun to its final script_finished message.
+# Per-session memory is the server's RSS growth over a warmed-up
+# baseline, divided by the number of sessions.
+#
+# AppTest can't drive concurrent sessions: every run swaps the global
+# Runtime instance in and out, so one session finishing breaks the others.
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+SEARCH_TERMS = ("refill", "insurance", "RX*", "pharmacist", "urgent")
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, round(percent / 100 * (len(values) - 1)))]
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+def _rss_mb(pid):
+    # Resident memory of the server process; None where /proc isn't available
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+
+def seed_inbox(directory, inbox_size):
+    # Record one batch of `inbox_size` calls, the inbox every session restores
+    from eventlog import EventLog
+    from generators import generate_sample_calls
+
+    log = EventLog(directory)
+    for call in generate_sample_calls(inbox_size):
+        log.append("ingested", call["call_id"], call=call, batch="loadtest")
+    log.close()
+
+
+class Session:
+    # One browser tab: a websocket plus the widget values the tab would send
+
+    def __init__(self, url, timings):
+        self.url = url
+        self.timings = timings
+        self.widget_states = {}
+        self.widget_ids = {}
+        self.ws = None
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+
+        self.ws = await websocket_connect(self.url, max_message_size=256 * 1024 * 1024)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+            self.ws = None
+
+    def keys(self, prefix):
+        return [key for key in self.widget_ids if key.startswith(prefix)]
+
+    def set_value(self, key, field, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=self.widget_ids[key])
+        setattr(state, field, value)
+        self.widget_states[state.id] = state
+
+    async def rerun(self, action, click=None):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        back = BackMsg()
+        back.rerun_script.widget_states.widgets.extend(self.widget_states.values())
+        if click is not None:
+            back.rerun_script.widget_states.widgets.append(WidgetState(id=self.widget_ids[click], trigger_value=True))
+
+        started = time.perf_counter()
+        await self.ws.write_message(back.SerializeToString(), binary=True)
+        widget_ids = {}
+        while True:
+            raw = await self.ws.read_message()
+            if raw is None:
+                raise RuntimeError(f"{action}: server closed the connection")
+            msg = ForwardMsg()
+            msg.ParseFromString(raw)
+            kind = msg.WhichOneof("type")
+            if kind == "delta" and msg.delta.WhichOneof("type") == "new_element":
+                element = msg.delta.new_element
+                widget = getattr(element, element.WhichOneof("type"))
+                if element.WhichOneof("type") == "exception":
+                    raise RuntimeError(f"{action}: {widget.type}: {widget.message}")
+                widget_id = getattr(widget, "id", "")
+                if widget_id.startswith("$$ID-"):
+                    # Keyed widget IDs end in the user key
+                    widget_ids[widget_id.split("-", 2)[2]] = widget_id
+            elif kind == "script_finished":
+                # st.rerun() ends the run early and starts another; wait for the last one
+                if msg.script_finished == ForwardMsg.FINISHED_SUCCESSFULLY:
+                    break
+                if msg.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError(f"{action}: script failed to compile")
+        self.timings.append((action, time.perf_counter() - started))
+        self.widget_ids = widget_ids
+        return self
+
+
+async def run_session(url, rng, timings, think_time=0.0):
+    async def step(action, click=None):
+        await session.rerun(action, click)
+        await asyncio.sleep(think_time)
+
+    session = Session(url, timings)
+    await session.connect()
+    await step("load")
+    session.set_value("search_query", "string_value", rng.choice(SEARCH_TERMS))
+    await step("search")
+    # Clearing the search brings every thread back alongside the filters
+    session.set_value("search_query", "string_value", "")
+    session.set_value("show_filters", "bool_value", True)
+    await step("filter")
+
+    await step("open thread", click=rng.choice(session.keys("analyze_button_")))
+    # A thread another session already analyzed opens on its stored results or ticket
+    for action, prefix in (("analyze", "analyze_transcript_"), ("generate ticket", "generate_ticket_")):
+        if session.keys(prefix):
+            await step(action, click=session.keys(prefix)[0])
+
+    # A reload is a new websocket and a new session; the old one is left to the server to clean up
+    session.close()
+    session = Session(url, timings)
+    await session.connect()
+    await step("reload")
+    return session
+
+
+def start_server(directory, port):
+    log_path = os.path.join(directory, "server.log")
+    with open(log_path, "w") as log:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "streamlit", "run", os.path.join(SRC_DIR, "main.py"),
+             "--server.headless", "true", "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+            cwd=SRC_DIR, env={**os.environ, "PHARMA_EVENT_LOG_DIR": directory},
+            stdout=subprocess.DEVNULL, stderr=log
+        )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            with open(log_path) as log:
+                raise RuntimeError(f"server exited: {log.read().strip()}")
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("server did not become healthy within 60s")
+
+
+async def measure(sessions, inbox_size, think_time=0.0, seed=None):
+    with tempfile.TemporaryDirectory() as directory:
+        seed_inbox(directory, inbox_size)
+        port = _free_port()
+        server = start_server(directory, port)
+        url = f"ws://localhost:{port}/_stcore/stream"
+        try:
+            # One throwaway session pays for the app's imports and cached resources
+            warmup = await run_session(url, random.Random(seed), [])
+            warmup.close()
+            await asyncio.sleep(1)
+            baseline = _rss_mb(server.pid)
+
+            timings = []
+            started = time.perf_counter()
+            results = await asyncio.gather(*(
+                run_session(url, random.Random(None if seed is None else seed + i), timings, think_time)
+                for i in range(1, sessions + 1)
+            ), return_exceptions=True)
+            elapsed = time.perf_counter() - started
+            loaded = _rss_mb(server.pid)
+            for result in results:
+                if isinstance(result, Session):
+                    result.close()
+        finally:
+            server.terminate()
+            server.wait()
+
+    latencies = [t for _, t in timings]
+    by_action = {}
+    for action, t in timings:
+        by_action.setdefault(action, []).append(t)
+    return {
+        "sessions": sessions,
+        "errors": [repr(result) for result in results if isinstance(result, Exception)],
+        "reruns": len(timings),
+        "elapsed": elapsed,
+        "p50": _percentile(latencies, 50) if latencies else 0,
+        "p95": _percentile(latencies, 95) if latencies else 0,
+        "p99": _percentile(latencies, 99) if latencies else 0,
+        "by_action": {action: _percentile(times, 50) for action, times in by_action.items()},
+        "session_mb": None if baseline is None else (loaded - baseline) / sessions,
+        "rss_mb": loaded
+    }
+
+
+def report(inbox_size, result):
+    session_mb = "n/a" if result["session_mb"] is None else f"{result['session_mb']:.1f}"
+    rss_mb = "n/a" if result["rss_mb"] is None else f"{result['rss_mb']:.0f}"
+    print(f"{inbox_size:>6} {result['sessions']:>8} {result['reruns']:>7} "
+          f"{result['p50'] * 1000:>9.0f} {result['p95'] * 1000:>9.0f} {result['p99'] * 1000:>9.0f} "
+          f"{result['reruns'] / result['elapsed']:>10.2f} {session_mb:>10} {rss_mb:>9}")
+    slowest = sorted(result["by_action"].items(), key=lambda item: -item[1])
+    print("       median ms: " + ", ".join(f"{action} {t * 1000:.0f}" for action, t in slowest))
+    for error in result["errors"]:
+        print(f"       session failed: {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the dashboard with concurrent browser sessions.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10, 20],
+                        help="Concurrent session counts to run")
+    parser.add_argument("--inbox-sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Inbox sizes (calls) to run each session count against")
+    parser.add_argument("--think-time", type=float, default=0.0, help="Seconds a session waits between actions")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible session scripts")
+    args = parser.parse_args(argv)
+
+    print(f"{'inbox':>6} {'sessions':>8} {'reruns':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'reruns/s':>10} {'MB/sess':>10} {'RSS MB':>9}")
+    for inbox_size in args.inbox_sizes:
+        for sessions in args.sessions:
+            report(inbox_size, asyncio.run(measure(sessions, inbox_size, args.think_time, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
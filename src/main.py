@@ -1,514 +1,20 @@
 import streamlit as st
 from datetime import datetime, timedelta
-import random
-import pandas as pd
-import json
+import os
 import time
 
-st.set_page_config(page_title="Pharmacy Calls Dashboard", page_icon="📞", layout="wide")
-
-
-def generate_varied_summary():
-    # Common elements that can be mixed and matched
-    medications = [
-        "blood pressure medication", "insulin", "antidepressants", "pain medication",
-        "cholesterol medication", "thyroid medication", "antibiotic prescription",
-        "asthma inhaler", "anti-anxiety medication", "heart medication"
-    ]
-    
-    situations = [
-        "running low on", "lost their", "needs clarification about dosage for",
-        "experiencing side effects from", "requesting refill for",
-        "concerned about interaction with", "needs prior authorization for",
-        "reported adverse reaction to", "seeking alternative to",
-        "cannot afford", "missed several doses of"
-    ]
-    
-    urgency_reasons = [
-        "due to upcoming travel plans",
-        "as current supply will run out tomorrow",
-        "due to worsening symptoms",
-        "because of insurance expiration",
-        "before leaving for vacation",
-        "after missing several doses",
-        "following doctor's new instructions",
-        "due to pharmacy closure",
-        "because of adverse reactions",
-        ""  # Empty string for cases without urgent reason
-    ]
-    
-    additional_contexts = [
-        "Insurance requires documentation.",
-        "Previous prescription shows no refills remaining.",
-        "Patient reported dizziness as side effect.",
-        "Needs copay assistance program information.",
-        "Recently switched from different medication.",
-        "Requires pharmacist consultation.",
-        "Doctor's office needs to be contacted.",
-        "Patient has questions about proper storage.",
-        "Concerned about drug interactions.",
-        "Requesting home delivery options.",
-        "Needs Spanish-speaking pharmacist.",
-        ""  # Empty string for cases without additional context
-    ]
-
-    # Generate the main situation
-    main_situation = f"Patient {random.choice(situations)} {random.choice(medications)}"
-    
-    # Maybe add urgency reason
-    if random.random() > 0.3:  # 70% chance to add urgency reason
-        urgency = random.choice(urgency_reasons)
-        if urgency:
-            main_situation += f" {urgency}"
-    
-    # Maybe add context
-    if random.random() > 0.5:  # 50% chance to add context
-        context = random.choice(additional_contexts)
-        if context:
-            main_situation += f" {context}"
-
-    # Determine intent and urgency based on content
-    if any(word in main_situation.lower() for word in ["tomorrow", "run out", "missing", "adverse", "worsening"]):
-        urgency = "High"
-        intent = "Urgent Refill Request"
-    elif "side effect" in main_situation.lower() or "adverse" in main_situation.lower():
-        urgency = "Medium"
-        intent = "Side Effect Report"
-    elif "insurance" in main_situation.lower() or "afford" in main_situation.lower():
-        urgency = "Medium"
-        intent = "Insurance Query"
-    else:
-        urgency = "Low"
-        intent = "General Inquiry"
-
-    # Determine sentiment based on content
-    if any(word in main_situation.lower() for word in ["concerned", "adverse", "worsening", "cannot afford"]):
-        sentiment = "Anxious"
-    elif "urgency" in main_situation.lower() or "tomorrow" in main_situation.lower():
-        sentiment = "Urgent"
-    else:
-        sentiment = random.choice(["Neutral", "Calm", "Inquiring"])
-
-    return {
-        "summary": main_situation,
-        "intent": intent,
-        "urgency": urgency,
-        "sentiment": sentiment
-    }
-
-def generate_voicemail_message(customer_name):
-    # Common voicemail components
-    rx_number = f"RX{random.randint(100000, 999999)}"
-    medications = [
-        "Lisinopril 10mg", "Metformin 1000mg", "Atorvastatin 40mg",
-        "Sertraline 50mg", "Levothyroxine 75mcg", "Amoxicillin 500mg",
-        "Omeprazole 20mg", "Gabapentin 300mg", "Hydrochlorothiazide 25mg"
-    ]
-    
-    callback_numbers = [
-        f"({random.randint(200,999)}) {random.randint(200,999)}-{random.randint(1000,9999)}"
-        for _ in range(3)
-    ]
-    
-    # Different types of voicemail scenarios
-    scenarios = [
-        {
-            "type": "refill_request",
-            "templates": [
-                f"Hi, this is {customer_name} calling about my prescription {rx_number} for {random.choice(medications)}. "
-                f"I'm running low and need a refill. My number is {random.choice(callback_numbers)}. "
-                "Please call me back to let me know when it will be ready.",
-
-                f"Hello, {customer_name} here. I need to refill my {random.choice(medications)}, "
-                f"prescription number {rx_number}. I'm down to my last few pills. "
-                f"You can reach me at {random.choice(callback_numbers)}. Thank you.",
-            ]
-        },
-        {
-            "type": "urgent_request",
-            "templates": [
-                f"This is {customer_name} and I urgently need my {random.choice(medications)}. "
-                f"I'm completely out and it's prescription {rx_number}. "
-                f"Please call me as soon as possible at {random.choice(callback_numbers)}. "
-                "This is really important.",
-
-                f"Hello, {customer_name} calling. I have an emergency with my prescription {rx_number}. "
-                f"I lost my medication bottle of {random.choice(medications)} while traveling. "
-                f"Please call me back immediately at {random.choice(callback_numbers)}. "
-                "I need this medication daily.",
-            ]
-        },
-        {
-            "type": "insurance_query",
-            "templates": [
-                f"Hi, this is {customer_name}. I'm calling about a problem with my insurance coverage "
-                f"for prescription {rx_number}. They're saying it needs prior authorization. "
-                f"Please call me back at {random.choice(callback_numbers)} to discuss this.",
-
-                f"Hello, {customer_name} here. I got a message saying there's an insurance issue "
-                f"with my {random.choice(medications)}. My number is {random.choice(callback_numbers)}. "
-                "I need to know what I need to do to get this resolved.",
-            ]
-        },
-        {
-            "type": "side_effect_concern",
-            "templates": [
-                f"This is {customer_name} calling about my prescription {rx_number} for {random.choice(medications)}. "
-                "I'm experiencing some side effects and need to speak with a pharmacist. "
-                f"My callback number is {random.choice(callback_numbers)}.",
-
-                f"Hi, {customer_name} here. I've been having some reactions to my new prescription "
-                f"{rx_number} and need to discuss this with someone. Please call me at "
-                f"{random.choice(callback_numbers)}. I'm concerned about continuing the medication.",
-            ]
-        },
-        {
-            "type": "transfer_request",
-            "templates": [
-                f"Hello, this is {customer_name}. I need to transfer my prescriptions from another pharmacy. "
-                f"I have about 5 medications including {random.choice(medications)}. "
-                f"Please call me back at {random.choice(callback_numbers)} to help with this process.",
-
-                f"Hi, {customer_name} calling about transferring my medications to your pharmacy. "
-                f"My current prescription number is {rx_number}. You can reach me at {random.choice(callback_numbers)}. "
-                "I'd like to get this started as soon as possible.",
-            ]
-        },
-        {
-            "type": "cost_concern",
-            "templates": [
-                f"Hi, this is {customer_name} calling about the cost of my prescription {rx_number}. "
-                f"The price seems much higher than usual for my {random.choice(medications)}. "
-                f"Please call me back at {random.choice(callback_numbers)} to discuss any discount options.",
-
-                f"Hello, {customer_name} here. I'm having trouble affording my prescription and "
-                "wanted to know if there are any cheaper alternatives or discount programs available. "
-                f"My number is {random.choice(callback_numbers)}.",
-            ]
-        }
-    ]
-    
-    # Select a random scenario and template
-    scenario = random.choice(scenarios)
-    message = random.choice(scenario["templates"])
-    
-    # Add common voicemail endings
-    endings = [
-        " Thanks for your help.",
-        " Please call me back when you can.",
-        " I appreciate your help with this.",
-        " Looking forward to hearing back from you.",
-        " Please let me know as soon as possible."
-    ]
-    
-    times_to_call = [
-        "I'm available anytime today.",
-        "Best time to reach me is in the afternoon.",
-        "Please call before 5pm if possible.",
-        "I'm available between 9am and 6pm.",
-        "You can call me back anytime.",
-        ""  # Empty string for cases where no time preference is given
-    ]
-    
-    message += random.choice(endings)
-    if random.random() > 0.5:  # 50% chance to add time preference
-        message += " " + random.choice(times_to_call)
-
-    return {
-        "voicemail_type": scenario["type"],
-        "message": message,
-        "timestamp": datetime.now() - timedelta(minutes=random.randint(5, 120)),
-        "duration": f"{random.randint(20, 90)} seconds",
-        "callback_number": random.choice(callback_numbers),
-        "prescription_mentioned": rx_number if "rx_number" in message else None,
-        "urgent": scenario["type"] == "urgent_request",
-        "requires_pharmacist": scenario["type"] in ["side_effect_concern", "urgent_request"],
-        "call_back_preference": random.choice([
-            "Morning", "Afternoon", "Evening", "ASAP", "Any time"
-        ]),
-        "auto_transcription_confidence": random.randint(85, 99)
-    }
-
-def generate_sample_calls(n_calls=10):
-    customers = [
-        "Sarah Johnson", "Mike Smith", "Emily Brown", "James Wilson", 
-        "Maria Garcia", "David Lee", "Lisa Anderson", "Robert Taylor", 
-        "Jennifer Martinez", "William Davis", "Emma Thompson", "John Carter",
-        "Patricia Rodriguez", "Michael Chang", "Susan Miller"
-    ]
-    
-    calls = []
-    for _ in range(n_calls):
-        customer_name = random.choice(customers)
-        voicemail = generate_voicemail_message(customer_name)
-        analysis = generate_enhanced_call_analysis()
-        
-        call = {
-            "call_id": f"CALL-{2024}{random.randint(1000, 9999)}",
-            "customer_name": customer_name,
-            "timestamp": voicemail["timestamp"],
-            "duration": voicemail["duration"],
-            "category": voicemail["voicemail_type"].replace("_", " ").title(),
-            "status": "Urgent" if voicemail["urgent"] else random.choice(["New", "Pending", "In Progress"]),
-            "callback_required": True,  # All voicemails require callbacks
-            "prescriptions_discussed": 1 if voicemail["prescription_mentioned"] else 0,
-            "voicemail_data": voicemail,
-            "metadata": generate_call_metadata(),
-            "analysis": analysis
-        }
-        calls.append(call)
-    
-    return calls
-
-def generate_call_analysis():
-    scenario = generate_varied_summary()
-    similar_cases = [
-        {
-            "case_id": f"CASE-{random.randint(1000, 9999)}",
-            "similarity": random.randint(75, 95),
-            "resolution": random.choice([
-                "Processed emergency refill and contacted doctor",
-                "Provided copay assistance information",
-                "Scheduled pharmacist consultation",
-                "Transferred prescription to new location",
-                "Contacted insurance for prior authorization",
-                "Applied discount card to reduce cost",
-                "Documented side effects and notified doctor",
-                "Arranged home delivery service",
-                "Provided medication interaction review",
-                "Completed insurance override request"
-            ])
-        }
-        for _ in range(random.randint(2, 4))
-    ]
-    
-    # Generate relevant key phrases based on the summary
-    possible_phrases = [
-        "medication shortage", "insurance coverage", "side effects", "urgent refill",
-        "prior authorization", "drug interaction", "vacation override", "lost medication",
-        "dosing schedule", "adverse reaction", "insurance denial", "travel emergency",
-        "copay assistance", "pharmacy transfer", "home delivery", "consultation required",
-        "doctor notification", "prescription expired", "language assistance", "payment plan"
-    ]
-    
-    # Select phrases that are relevant to the summary
-    relevant_phrases = [phrase for phrase in possible_phrases 
-                       if any(word in scenario["summary"].lower() for word in phrase.split())]
-    
-    # Add some random phrases if we don't have enough relevant ones
-    if len(relevant_phrases) < 3:
-        additional_phrases = random.sample([p for p in possible_phrases if p not in relevant_phrases],
-                                        k=min(3, len(possible_phrases) - len(relevant_phrases)))
-        relevant_phrases.extend(additional_phrases)
-    
-    return {
-        "call_summary": scenario["summary"],
-        "primary_intent": scenario["intent"],
-        "confidence_score": random.randint(85, 99),
-        "urgency_level": scenario["urgency"],
-        "sentiment": scenario["sentiment"],
-        "similar_cases": similar_cases,
-        "key_phrases": random.sample(relevant_phrases, k=min(len(relevant_phrases), 4))
-    }
-
-
-
-def generate_sample_transcript(customer_name):
-    rx_number = f"RX{random.randint(100000, 999999)}"
-    medications = ["Amoxicillin 500mg", "Lisinopril 10mg", "Metformin 1000mg", "Sertraline 50mg", "Omeprazole 20mg"]
-    selected_med = random.choice(medications)
-    
-    return {
-        "automated_system": "Thank you for calling CVS Pharmacy. For prescription refills, press 1. Para español, presione 2.",
-        "customer": f"Hi, this is {customer_name}. I need to refill my prescription {rx_number}.",
-        "pharmacist": f"Hello {customer_name}, I can help you with that. I see your prescription for {selected_med}. When would you like to pick this up?",
-        "customer_response": "Can I get it today? I'm running low on my medication.",
-        "pharmacist_closing": f"Yes, I can have that ready in about 2 hours. We'll send you a text message when it's ready. Is there anything else I can help you with?",
-        "customer_closing": "No, that's all. Thank you for your help!"
-    }
-
-def generate_call_metadata():
-    departments = ["Pharmacy", "Insurance", "Medical Review", "Customer Service", "Clinical Support"]
-    priorities = ["High", "Medium", "Low"]
-    ticket_types = ["Medication Issue", "Insurance Claim", "Prescription Renewal", "Side Effect Report", "Drug Interaction"]
-    
-    return {
-        "ticket_id": f"TKT-{random.randint(10000, 99999)}",
-        "department": random.choice(departments),
-        "priority": random.choice(priorities),
-        "ticket_type": random.choice(ticket_types),
-        "assigned_to": f"Agent-{random.randint(100, 999)}",
-        "sla_hours": random.choice([2, 4, 8, 24, 48]),
-        "tags": random.sample(["#urgent", "#callback", "#prescription", "#insurance", "#review", "#followup"], 
-                            k=random.randint(2, 4))
-    }
-
-
-
-def analyze_intent(transcript):
-    # Extract conversation text
-    customer_text = transcript['customer'] + " " + transcript['customer_response']
-    
-    # Keywords for different intents
-    intent_keywords = {
-        "Urgent Refill Request": ["today", "running low", "need", "refill", "emergency", "urgent", "out of"],
-        "General Refill": ["refill", "prescription", "medication", "renew"],
-        "Side Effect Report": ["side effect", "reaction", "feeling", "dizzy", "sick", "pain"],
-        "Insurance Query": ["insurance", "coverage", "cost", "pay", "price"],
-        "Drug Information": ["information", "how to", "when", "effects", "instructions"],
-        "Prescription Transfer": ["transfer", "move", "different", "another", "pharmacy"],
-        "Medication Inquiry": ["about", "question", "ask", "explain", "understand"],
-    }
-
-def generate_enhanced_call_analysis():
-    # Generate more detailed sentiment analysis
-    sentiment_analysis = {
-        "primary_emotion": random.choice([
-            "Anxious", "Frustrated", "Satisfied", "Confused", 
-            "Urgent", "Neutral", "Concerned", "Appreciative"
-        ]),
-        "secondary_emotions": random.sample([
-            "Worried about cost", "Uncertain about instructions",
-            "Relieved about solution", "Stressed about timeline",
-            "Grateful for help", "Confused about process"
-        ], k=2),
-        "confidence_score": random.randint(85, 99),
-        "emotion_triggers": random.sample([
-            "medication cost", "insurance coverage",
-            "side effects", "waiting time",
-            "prescription availability", "doctor approval"
-        ], k=2)
-    }
-
-    # Generate compliance and risk indicators
-    risk_assessment = {
-        "risk_level": random.choice(["Low", "Medium", "High"]),
-        "risk_factors": random.sample([
-            "Missed doses", "Drug interaction potential",
-            "Side effect concerns", "Delayed refill",
-            "Insurance expiration", "Multiple pharmacy usage"
-        ], k=random.randint(1, 3)),
-        "compliance_score": random.randint(60, 100),
-        "adherence_patterns": random.choice([
-            "Regular refills", "Occasional delays",
-            "Frequent missed doses", "Inconsistent pickup"
-        ])
-    }
-
-    # Generate action items and recommendations
-    action_items = []
-    possible_actions = [
-        {
-            "action": "Schedule follow-up call",
-            "priority": "High",
-            "deadline": "24 hours",
-            "reason": "Discuss side effects"
-        },
-        {
-            "action": "Contact prescribing physician",
-            "priority": "Medium",
-            "deadline": "48 hours",
-            "reason": "Verify dosage change"
-        },
-        {
-            "action": "Process prior authorization",
-            "priority": "High",
-            "deadline": "24 hours",
-            "reason": "Insurance requirement"
-        },
-        {
-            "action": "Update patient profile",
-            "priority": "Low",
-            "deadline": "72 hours",
-            "reason": "New contact information"
-        },
-        {
-            "action": "Schedule medication review",
-            "priority": "Medium",
-            "deadline": "48 hours",
-            "reason": "Multiple medication interactions"
-        }
-    ]
-    action_items = random.sample(possible_actions, k=random.randint(1, 3))
-
-    # Generate regulatory compliance check
-    compliance_check = {
-        "hipaa_compliant": True,
-        "phi_disclosed": random.choice([True, False]),
-        "required_disclaimers_given": random.choice([True, False]),
-        "consent_verified": random.choice([True, False]),
-        "documentation_complete": random.choice([True, False])
-    }
+from config import EVENT_LOG_DIR, EVENT_SNAPSHOT_EVERY, NON_URGENT_STATUSES, STORE_IDS
+from dedup import group_calls
+from eventlog import EventLog, restore_call
+from generators import format_ticket, generate_history_calls, generate_sample_calls, generate_ticket
+from rollups import bucket_start
+from shards import parallel_min_calls
+from stores import CallStores
 
-    # Generate call quality metrics
-    call_quality = {
-        "clarity_score": random.randint(80, 100),
-        "resolution_completeness": random.randint(70, 100),
-        "customer_satisfaction_predicted": random.randint(60, 100),
-        "follow_up_needed": random.choice([True, False]),
-        "escalation_required": random.choice([True, False])
-    }
-
-    # Generate key topics and themes
-    topics_identified = random.sample([
-        "Prescription Renewal", "Insurance Coverage",
-        "Side Effects", "Drug Interactions",
-        "Payment Concerns", "Delivery Options",
-        "Dosage Instructions", "Generic Alternatives",
-        "Prior Authorization", "Pharmacy Transfer"
-    ], k=random.randint(2, 4))
-
-    # Generate historical context analysis
-    historical_context = {
-        "previous_interactions": random.randint(0, 5),
-        "common_issues": random.sample([
-            "Regular early refill requests",
-            "Frequent insurance queries",
-            "Multiple medication adjustments",
-            "Consistent payment concerns",
-            "Regular side effect reports"
-        ], k=random.randint(1, 2)),
-        "patient_profile_flags": random.sample([
-            "Chronic condition",
-            "Multiple prescribers",
-            "Complex medication regimen",
-            "Special handling required",
-            "Preferred language support"
-        ], k=random.randint(1, 2))
-    }
-
-    # Generate AI recommendations
-    ai_recommendations = {
-        "immediate_actions": random.sample([
-            "Process emergency refill",
-            "Schedule pharmacist consultation",
-            "Contact prescribing physician",
-            "Update insurance information",
-            "Document reported side effects"
-        ], k=random.randint(1, 2)),
-        "long_term_suggestions": random.sample([
-            "Enroll in auto-refill program",
-            "Schedule regular medication review",
-            "Consider medication synchronization",
-            "Recommend patient assistance program",
-            "Set up medication reminders"
-        ], k=random.randint(1, 2))
-    }
+st.set_page_config(page_title="Pharmacy Calls Dashboard", page_icon="📞", layout="wide")
 
-    return {
-        "sentiment_analysis": sentiment_analysis,
-        "risk_assessment": risk_assessment,
-        "action_items": action_items,
-        "compliance_check": compliance_check,
-        "call_quality": call_quality,
-        "topics_identified": topics_identified,
-        "historical_context": historical_context,
-        "ai_recommendations": ai_recommendations,
-        "analysis_timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "analysis_version": "2.0.0"
-    }
 
-def create_ai_analysis_flow(selected_call):
+def create_ai_analysis_flow(selected_call, thread):
     st.markdown("## 🤖 Call Analysis")
     
     # Display voicemail instead of transcript
@@ -530,6 +36,29 @@ def create_ai_analysis_flow(selected_call):
                 st.error("⚠️ Marked as Urgent")
             if voicemail['requires_pharmacist']:
                 st.warning("👩‍⚕️ Requires Pharmacist")
+            # Status changes and callbacks are recorded in the event log
+            statuses = ["Urgent", *NON_URGENT_STATUSES]
+            new_status = st.selectbox(
+                "Status", statuses, index=statuses.index(selected_call['status']),
+                key=f"status_{selected_call['call_id']}"
+            )
+            if new_status != selected_call['status']:
+                selected_call['status'] = new_status
+                event_log.append("status_changed", selected_call['call_id'], status=new_status)
+                call_stores.update_call(selected_call)
+            if selected_call['callback_required']:
+                if st.button("📞 Mark Called Back", key=f"called_back_{selected_call['call_id']}"):
+                    selected_call['callback_required'] = False
+                    event_log.append("called_back", selected_call['call_id'])
+                    call_stores.update_call(selected_call)
+                    st.rerun()
+            else:
+                st.success("📞 Called Back")
+    # Earlier voicemails in the same thread are analyzed together with the latest one
+    if thread['size'] > 1:
+        st.markdown(f"**Earlier messages in this thread ({thread['size'] - 1}):**")
+        for earlier in thread['calls'][1:]:
+            st.markdown(f"- {earlier['timestamp'].strftime('%Y-%m-%d %H:%M')} ({earlier['call_id']}): _{earlier['voicemail_data']['message']}_")
     st.markdown("---")
     # Initial state - show analyze button
     if st.session_state.analysis_stage == 'initial':
@@ -541,8 +70,8 @@ def create_ai_analysis_flow(selected_call):
     elif st.session_state.analysis_stage == 'analyzing':
         status = st.status("🔄 Analysis in Progress...", expanded=True)
         with status:
-            # Generate enhanced analysis
-            enhanced_analysis = generate_enhanced_call_analysis()
+            # The call's own analysis is what the compliance audit reports on, so the panel shows the same
+            enhanced_analysis = selected_call['analysis']
             
             # Show processing steps
             st.write("🎯 Initializing analysis pipeline...")
@@ -569,6 +98,8 @@ def create_ai_analysis_flow(selected_call):
             time.sleep(1)
             
             st.session_state.enhanced_analysis = enhanced_analysis
+            st.session_state.thread_analyses[thread['thread_id']] = enhanced_analysis
+            event_log.append("analyzed", selected_call['call_id'], thread_id=thread['thread_id'], analysis=enhanced_analysis)
             st.session_state.analysis_stage = 'show_results'
             status.update(label="✅ Analysis Complete!", state="complete")
             st.rerun()
@@ -652,73 +183,270 @@ def create_ai_analysis_flow(selected_call):
 
         # Option to generate ticket
         if st.button("✅ Generate Support Ticket", type="primary", key=f"generate_ticket_{selected_call['call_id']}"):
+            st.session_state.ticket = generate_ticket(enhanced_analysis)
+            st.session_state.thread_tickets[thread['thread_id']] = st.session_state.ticket
+            event_log.append("ticketed", selected_call['call_id'], thread_id=thread['thread_id'], ticket=st.session_state.ticket)
             st.session_state.analysis_stage = 'ticket_generated'
             st.rerun()
 
     # Show generated ticket
     elif st.session_state.analysis_stage == 'ticket_generated':
         st.success("### ✅ Support Ticket Generated")
-        enhanced_analysis = st.session_state.enhanced_analysis
-        
-        ticket_id = f"TKT-{datetime.now().strftime('%Y%m%d')}-{random.randint(1000,9999)}"
         
         # Display ticket details
-        st.code(f"""
-Ticket ID: {ticket_id}
-Created: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-Status: Active
-Priority: {enhanced_analysis['risk_assessment']['risk_level']}
-Risk Level: {enhanced_analysis['risk_assessment']['risk_level']}
-Required Actions: {len(enhanced_analysis['action_items'])}
-Compliance Score: {enhanced_analysis['risk_assessment']['compliance_score']}%
-Follow-up Required: {"Yes" if enhanced_analysis['call_quality']['follow_up_needed'] else "No"}
-
-Primary Concerns:
-{chr(10).join(f"- {topic}" for topic in enhanced_analysis['topics_identified'])}
-
-Immediate Actions Required:
-{chr(10).join(f"- {action}" for action in enhanced_analysis['ai_recommendations']['immediate_actions'])}
-        """)
+        st.code(format_ticket(st.session_state.ticket))
         
         if st.button("🔄 Start New Analysis", key=f"new_analysis_{selected_call['call_id']}"):
             st.session_state.analysis_stage = 'initial'
             st.rerun()
 
-def generate_sample_calls(n_calls=10):
-    customers = [
-        "Sarah Johnson", "Mike Smith", "Emily Brown", "James Wilson", 
-        "Maria Garcia", "David Lee", "Lisa Anderson", "Robert Taylor", 
-        "Jennifer Martinez", "William Davis", "Emma Thompson", "John Carter",
-        "Patricia Rodriguez", "Michael Chang", "Susan Miller"
-    ]
-    
-    calls = []
-    for _ in range(n_calls):
-        customer_name = random.choice(customers)
-        voicemail = generate_voicemail_message(customer_name)
-        analysis = generate_enhanced_call_analysis()
-        
-        # Extract just the number from the duration string (e.g., "45 seconds" -> 45)
-        duration_seconds = int(voicemail["duration"].split()[0])
-        
-        call = {
-            "call_id": f"CALL-{2024}{random.randint(1000, 9999)}",
-            "customer_name": customer_name,
-            "timestamp": voicemail["timestamp"],
-            "duration_seconds": duration_seconds,  # Store the duration in seconds
-            "duration_display": voicemail["duration"],  # Store the display format
-            "category": voicemail["voicemail_type"].replace("_", " ").title(),
-            "status": "Urgent" if voicemail["urgent"] else random.choice(["New", "Pending", "In Progress"]),
-            "callback_required": True,  # All voicemails require callbacks
-            "prescriptions_discussed": 1 if voicemail["prescription_mentioned"] else 0,
-            "voicemail_data": voicemail,
-            "metadata": generate_call_metadata(),
-            "analysis": analysis
-        }
-        calls.append(call)
-    
+@st.cache_resource
+def get_event_log():
+    # One log per server process, shared by every session; opening it replays from the last snapshot
+    return EventLog(EVENT_LOG_DIR, snapshot_every=EVENT_SNAPSHOT_EVERY)
+
+@st.cache_resource
+def get_call_stores():
+    # Built from the full log once per server process and shared by every session. The
+    # derived stores aren't persisted: every start re-ingests each logged call, inbox and
+    # backfilled alike, so startup grows with the log (~3 s per 10k calls, mostly restoring and
+    # indexing them).
+    call_stores = CallStores()
+    event_log = get_event_log()
+    logged_calls = {}
+    with event_log.lock:
+        sources = event_log.state.get("sources", {})
+        for call_id, call in event_log.state["calls"].items():
+            logged_calls.setdefault(sources.get(call_id, "inbox"), []).append(restore_call(call))
+    for source, calls in logged_calls.items():
+        call_stores.ingest(calls, **CALL_SOURCES[source])
+    return call_stores
+
+@st.cache_resource
+def get_process_pool():
+    # Shared by every session; workers are spawned so they don't inherit the Streamlit server.
+    # On a single core shipping the shards to a worker only adds pickling, so aggregate inline.
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if (os.cpu_count() or 1) < 2:
+        return None
+    return ProcessPoolExecutor(os.cpu_count(), mp_context=multiprocessing.get_context("spawn"))
+
+def start_new_batch():
+    # Generate a fresh inbox and record it, so it survives a refresh or restart
+    calls = generate_sample_calls()
+    batch = datetime.now().isoformat()
+    for call in calls:
+        event_log.append("ingested", call["call_id"], call=call, batch=batch)
+    ingest_calls(calls)
     return calls
 
+# Which shared stores each source of calls feeds. Sample history is searchable but kept out
+# of the store shards, whose regional metrics cover live calls; other stores' sample calls
+# only feed the shards and reports, since the inbox search is for this store's voicemails.
+CALL_SOURCES = {
+    "inbox": {"index": True, "shard": True},
+    "history": {"index": True, "shard": False},
+    "stores": {"index": False, "shard": True}
+}
+
+def ingest_calls(calls, source="inbox"):
+    # Feed newly generated calls to every store that is maintained incrementally
+    call_stores.ingest(calls, **CALL_SOURCES[source])
+
+def backfill_calls(calls, source):
+    # Record calls loaded outside the inbox too, so they survive a restart
+    for call in calls:
+        event_log.append("backfilled", call["call_id"], call=call, source=source)
+    ingest_calls(calls, source)
+
+def history_loaded():
+    with event_log.lock:
+        return "history" in event_log.state.get("sources", {}).values()
+
+def load_thread_results():
+    # Every logged analysis and ticket, including other sessions' and earlier inboxes'
+    # (search can reopen their calls), so a thread is never analyzed or ticketed twice
+    with event_log.lock:
+        st.session_state.thread_analyses = dict(event_log.state["thread_analyses"])
+        st.session_state.thread_tickets = dict(event_log.state["thread_tickets"])
+
+def create_analytics_view(rollups):
+    # altair (and pandas, through the rollup frames) are only imported once a report page is opened
+    import altair as alt
+
+    st.title("📈 Voicemail Analytics")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        granularity = st.radio(
+            "Granularity", ["hour", "day", "week"], index=1,
+            format_func=str.title, horizontal=True, key="analytics_granularity"
+        )
+    with col2:
+        days = st.select_slider(
+            "Period", options=[1, 7, 30, 90, 365], value=30,
+            format_func=lambda d: f"Last {d} days", key="analytics_days"
+        )
+
+    # Charts read the pre-aggregated rollup buckets; raw calls are never regrouped here
+    start = bucket_start(datetime.now() - timedelta(days=days), granularity)
+    with call_stores.lock:
+        totals = rollups.totals(granularity, start=start)
+        category_mix = rollups.category_mix(granularity, start=start)
+    if totals.empty:
+        st.info("No calls ingested for this period yet.")
+        return
+
+    x_axis = alt.X("bucket:T", title=None)
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("### Call Volume")
+        st.altair_chart(
+            alt.Chart(totals).mark_bar().encode(
+                x=x_axis, y=alt.Y("calls:Q", title="Calls"), tooltip=["bucket:T", "calls:Q"]
+            ),
+            use_container_width=True
+        )
+        st.markdown("### Average Duration")
+        st.altair_chart(
+            alt.Chart(totals).mark_line(point=True).encode(
+                x=x_axis,
+                y=alt.Y("avg_duration_minutes:Q", title="Minutes"),
+                tooltip=["bucket:T", alt.Tooltip("avg_duration_minutes:Q", format=".2f")]
+            ),
+            use_container_width=True
+        )
+    with col2:
+        st.markdown("### Urgent Share")
+        st.altair_chart(
+            alt.Chart(totals).mark_line(point=True, color="#d62728").encode(
+                x=x_axis,
+                y=alt.Y("urgent_share:Q", title="Urgent", axis=alt.Axis(format="%")),
+                tooltip=["bucket:T", alt.Tooltip("urgent_share:Q", format=".1%")]
+            ),
+            use_container_width=True
+        )
+        st.markdown("### Category Mix")
+        st.altair_chart(
+            alt.Chart(category_mix).mark_bar().encode(
+                x=x_axis,
+                y=alt.Y("calls:Q", stack="normalize", title="Share of Calls", axis=alt.Axis(format="%")),
+                color=alt.Color("category:N", title="Category"),
+                tooltip=["bucket:T", "category:N", "calls:Q"]
+            ),
+            use_container_width=True
+        )
+
+def create_compliance_audit_view(call_stores):
+    from audit import (BREAKDOWNS, COMPLIANCE_CHECKS, failing_calls, failure_rates,
+                       score_distribution, score_summary)
+
+    st.title("🛡️ Compliance Audit")
+
+    days = st.select_slider(
+        "Period", options=[7, 30, 90, 365], value=30,
+        format_func=lambda d: f"Last {d} days", key="audit_days"
+    )
+
+    # The call history is flattened once per ingest; filtering and aggregation below are vectorized
+    frame = call_stores.audit_frame()
+    frame = frame[frame["timestamp"] >= datetime.now() - timedelta(days=days)]
+    if frame.empty:
+        st.info("No calls ingested for this period yet.")
+        return
+
+    rate_labels = [label for _, label in COMPLIANCE_CHECKS.values()] + ["Any Failure"]
+    rate_columns = {
+        label: st.column_config.NumberColumn(label, format="%.1f%%") for label in rate_labels
+    }
+
+    st.markdown(f"### 🔒 Compliance Failure Rates ({len(frame)} calls)")
+    overall = failure_rates(frame)
+    cols = st.columns(len(rate_labels))
+    for col, label in zip(cols, rate_labels):
+        with col:
+            st.metric(label, f"{overall[label].iloc[0]:.1%}")
+
+    breakdown = st.radio(
+        "Break down by", list(BREAKDOWNS), format_func=BREAKDOWNS.get,
+        horizontal=True, key="audit_breakdown"
+    )
+    rates = failure_rates(frame, by=breakdown)
+    rates[rate_labels] = rates[rate_labels] * 100
+    st.dataframe(rates, column_config=rate_columns, use_container_width=True)
+
+    st.markdown("### 📊 Call Quality Scores")
+    col1, col2 = st.columns(2)
+    with col1:
+        st.dataframe(score_summary(frame).round(1), use_container_width=True)
+    with col2:
+        st.bar_chart(score_distribution(frame))
+
+    st.markdown("### 🔍 Failing Calls")
+    col1, col2 = st.columns(2)
+    with col1:
+        check = st.selectbox(
+            "Check", [None, *COMPLIANCE_CHECKS],
+            format_func=lambda c: "Any Failure" if c is None else COMPLIANCE_CHECKS[c][1],
+            key="audit_check"
+        )
+    with col2:
+        group = st.selectbox(
+            BREAKDOWNS[breakdown], ["All", *rates.index], key=f"audit_group_{breakdown}"
+        )
+    failing = failing_calls(frame, check=check, group_by=breakdown, group=None if group == "All" else group)
+    st.caption(f"{len(failing)} failing calls")
+    st.dataframe(failing, hide_index=True, use_container_width=True)
+
+def create_regional_view(region):
+    st.title("🏬 Regional View")
+
+    if st.button(f"🏪 Load Sample Calls for {len(STORE_IDS)} Stores", key="load_stores_button"):
+        with st.spinner("Generating store calls..."):
+            for store_id in STORE_IDS:
+                backfill_calls(generate_sample_calls(500, store_id=store_id), "stores")
+
+    with call_stores.lock:
+        store_ids = region.store_ids()
+    stores = st.multiselect("Stores", store_ids, key="region_stores") or store_ids
+    if not stores:
+        st.info("No store calls ingested yet.")
+        return
+
+    # Each store is aggregated on its own shard; regions too small to win back the pickling and
+    # round trips (see config's measured shard costs) are aggregated inline
+    with call_stores.lock:
+        parallel = region.size(stores) >= parallel_min_calls(len(stores), os.cpu_count() or 1)
+        executor = get_process_pool() if parallel else None
+        metrics = region.aggregate(stores, executor=executor)
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Calls", metrics["total_calls"])
+    with col2:
+        st.metric("Urgent Calls", metrics["urgent_calls"])
+    with col3:
+        st.metric("Callbacks Needed", metrics["callbacks_needed"])
+    with col4:
+        st.metric("Avg Duration", f"{metrics['avg_duration_minutes']} min")
+
+    import pandas as pd
+
+    st.markdown(f"### 🏪 Stores ({len(stores)})")
+    by_store = pd.DataFrame.from_dict(metrics["by_store"], orient="index")
+    st.dataframe(
+        by_store[["total_calls", "urgent_calls", "callbacks_needed", "avg_duration_minutes"]],
+        use_container_width=True
+    )
+
+    st.markdown("### 📂 Calls by Category")
+    st.bar_chart(pd.DataFrame({
+        "All Calls": pd.Series(metrics["categories"]),
+        "Urgent Calls": pd.Series(metrics["urgent_by_category"])
+    }).fillna(0))
+
 # Modified dashboard metrics calculation
 def calculate_dashboard_metrics(calls):
     total_calls = len(calls)
@@ -737,9 +465,20 @@ def calculate_dashboard_metrics(calls):
     }
 
 
-# Initialize session states at the start
+event_log = get_event_log()
+call_stores = get_call_stores()
+
+# Initialize session states at the start, rebuilding them from the event log when it has an inbox
 if 'static_calls' not in st.session_state:
-    st.session_state.static_calls = generate_sample_calls()
+    with event_log.lock:
+        logged_inbox = [restore_call(event_log.state["calls"][call_id]) for call_id in event_log.state["inbox"]]
+    st.session_state.static_calls = logged_inbox or start_new_batch()
+
+if 'threads' not in st.session_state:
+    st.session_state.threads = group_calls(st.session_state.static_calls)
+
+if 'thread_analyses' not in st.session_state or 'thread_tickets' not in st.session_state:
+    load_thread_results()
 
 if 'show_ai_analysis' not in st.session_state:
     st.session_state.show_ai_analysis = False
@@ -750,11 +489,39 @@ if 'selected_call' not in st.session_state:
 if 'analysis_stage' not in st.session_state:
     st.session_state.analysis_stage = 'initial'
 
+# Sidebar navigation between the inbox and the reporting pages
+view = st.sidebar.radio(
+    "View", ["📞 Inbox", "📈 Analytics", "🛡️ Compliance Audit", "🏬 Regional View"], key="view"
+)
+
+# The history is a fixed 12 months, so it's loaded once; loading it again would double the rollups
+if st.sidebar.button("📥 Load 12 Months of Sample History", key="load_history_button", disabled=history_loaded()):
+    with st.spinner("Generating sample history..."):
+        # Held while checking and loading, so two sessions clicking at once load it only once
+        with call_stores.lock:
+            if not history_loaded():
+                backfill_calls(generate_history_calls(), "history")
+    st.rerun()
+if history_loaded():
+    st.sidebar.caption("12 months of sample history loaded.")
+
+if view == "📈 Analytics":
+    create_analytics_view(call_stores.rollups)
+    st.stop()
+elif view == "🛡️ Compliance Audit":
+    create_compliance_audit_view(call_stores)
+    st.stop()
+elif view == "🏬 Regional View":
+    create_regional_view(call_stores.region)
+    st.stop()
+
 
 # Clear cache button
 if st.button("🔄 Clear Cache and Reload", key="clear_cache_button"):
     st.cache_data.clear()
-    st.session_state.static_calls = generate_sample_calls()
+    st.session_state.static_calls = start_new_batch()
+    st.session_state.threads = group_calls(st.session_state.static_calls)
+    load_thread_results()
     st.session_state.show_ai_analysis = False
     st.session_state.selected_call = None
     st.session_state.analysis_stage = 'initial'
@@ -781,10 +548,42 @@ with col3:
 with col4:
     st.metric("Pending Callbacks", callbacks)
 
-# Display voicemails
+# Display voicemails, grouped into threads of repeat calls about the same request
 st.markdown("### Recent Voicemails")
 
-for call in sorted(st.session_state.static_calls, key=lambda x: x['timestamp'], reverse=True):
+displayed_threads = st.session_state.threads
+search_col, page_col = st.columns([4, 1])
+with search_col:
+    search_query = st.text_input(
+        "🔎 Search voicemails",
+        key="search_query",
+        placeholder='Message, customer, call ID or RX number — use "quoted phrases" and prefix*'
+    )
+if search_query:
+    with page_col:
+        search_page = st.number_input("Page", min_value=1, value=1, step=1, key="search_page")
+    results = call_stores.search(search_query, page=int(search_page))
+    # Results come back newest first; show each matching thread once, in that order.
+    # Hits from earlier inboxes aren't in any current thread and are shown on their own.
+    threads_by_call = {c['call_id']: t for t in st.session_state.threads for c in t['calls']}
+    displayed_threads = list({
+        thread['thread_id']: thread
+        for thread in (
+            threads_by_call.get(hit['call_id']) or {
+                "thread_id": f"THREAD-{hit['call_id']}",
+                "calls": [hit],
+                "latest": hit,
+                "size": 1,
+                "urgent": hit['voicemail_data']['urgent']
+            }
+            for hit in results['calls']
+        )
+    }.values())
+    total_pages = max(1, -(-results['total'] // results['page_size']))
+    st.caption(f"{results['total']} matching voicemails — page {results['page']} of {total_pages}")
+
+for thread in displayed_threads:
+    call = thread['latest']
     with st.container():
         st.markdown("---")
         col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
@@ -792,6 +591,8 @@ for call in sorted(st.session_state.static_calls, key=lambda x: x['timestamp'],
         with col1:
             st.write(f"**{call['call_id']} - {call['customer_name']}**")
             st.write(f"_{call['voicemail_data']['message']}_")
+            if thread['size'] > 1:
+                st.caption(f"🔁 {thread['size']} voicemails in this thread")
         
         with col2:
             st.write(f"Time: {call['timestamp'].strftime('%Y-%m-%d %H:%M')}")
@@ -801,26 +602,37 @@ for call in sorted(st.session_state.static_calls, key=lambda x: x['timestamp'],
             status_color = "🔴" if call['status'] == "Urgent" else "🟡" if call['status'] == "Pending" else "🟢"
             st.write(f"Status: {status_color} {call['status']}")
             st.write(f"Category: {call['category']}")
-            if call['voicemail_data']['urgent']:
+            if thread['urgent']:
                 st.error("⚠️ URGENT")
         
         with col4:
-            if st.button("🔍 Analyze", key=f"analyze_button_{call['call_id']}"):
+            if st.button("🔍 Analyze", key=f"analyze_button_{thread['thread_id']}"):
                 st.session_state.selected_call = call
-                st.session_state.analysis_stage = 'initial'
+                # Each thread is analyzed only once; reopening it shows the stored results or ticket
+                if thread['thread_id'] in st.session_state.thread_tickets:
+                    st.session_state.enhanced_analysis = call['analysis']
+                    st.session_state.ticket = st.session_state.thread_tickets[thread['thread_id']]
+                    st.session_state.analysis_stage = 'ticket_generated'
+                elif thread['thread_id'] in st.session_state.thread_analyses:
+                    st.session_state.enhanced_analysis = call['analysis']
+                    st.session_state.analysis_stage = 'show_results'
+                else:
+                    st.session_state.analysis_stage = 'initial'
         
         # Show analysis section if needed
         if (st.session_state.show_ai_analysis or 
             (st.session_state.selected_call and st.session_state.selected_call['call_id'] == call['call_id'])):
             st.markdown("---")
-            create_ai_analysis_flow(call)
+            create_ai_analysis_flow(call, thread)
 
 # Function to reset session state
 def reset_session_state():
     st.session_state.show_ai_analysis = False
     st.session_state.selected_call = None
     st.session_state.analysis_stage = 'initial'
-    st.session_state.static_calls = generate_sample_calls()
+    st.session_state.static_calls = start_new_batch()
+    st.session_state.threads = group_calls(st.session_state.static_calls)
+    load_thread_results()
 
 # Add a footer
 st.markdown("---")
@@ -834,7 +646,7 @@ with col2:
     st.markdown(f"**Callbacks Required:** {callbacks} ({round(callbacks/total_calls * 100, 1)}%)")
 
 # Optional: Add filtering and sorting controls
-if st.checkbox("Show Filtering Options"):
+if st.checkbox("Show Filtering Options", key="show_filters"):
     col1, col2, col3 = st.columns(3)
     with col1:
         status_filter = st.multiselect(
@@ -0,0 +1,91 @@
+from collections import Counter
+from datetime import timedelta
+
+GRANULARITIES = ("hour", "day", "week")
+
+
+def bucket_start(timestamp, granularity):
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    day = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+class RollupStore:
+    # Pre-aggregated call statistics per hour, day and week.
+    #
+    # Each bucket keeps additive counters only (calls, urgent calls, summed
+    # duration, calls per category), so ingesting a call touches one bucket
+    # per granularity and derived values like urgent share or average
+    # duration are computed from the counters when a chart asks for them.
+    # Feed every call exactly once, e.g. right after it is generated.
+    # pandas is only imported when a chart first asks for a frame.
+
+    def __init__(self):
+        self.buckets = {granularity: {} for granularity in GRANULARITIES}
+        self._frames = {}
+
+    def ingest(self, calls):
+        for call in calls:
+            urgent = call["status"] == "Urgent"
+            duration = call.get("duration_seconds", 0)
+            for granularity, buckets in self.buckets.items():
+                start = bucket_start(call["timestamp"], granularity)
+                bucket = buckets.get(start)
+                if bucket is None:
+                    bucket = buckets[start] = {
+                        "calls": 0,
+                        "urgent_calls": 0,
+                        "duration_seconds": 0,
+                        "categories": Counter()
+                    }
+                bucket["calls"] += 1
+                bucket["urgent_calls"] += urgent
+                bucket["duration_seconds"] += duration
+                bucket["categories"][call["category"]] += 1
+        if calls:
+            self._frames.clear()
+
+    def _frame(self, granularity):
+        # Frames are rebuilt at most once per ingest, not on every rerun
+        if granularity not in self._frames:
+            import pandas as pd
+
+            buckets = self.buckets[granularity]
+            starts = sorted(buckets)
+            totals = pd.DataFrame({
+                "bucket": pd.to_datetime(starts),
+                "calls": [buckets[s]["calls"] for s in starts],
+                "urgent_calls": [buckets[s]["urgent_calls"] for s in starts],
+                "duration_seconds": [buckets[s]["duration_seconds"] for s in starts]
+            })
+            totals["urgent_share"] = totals["urgent_calls"] / totals["calls"]
+            totals["avg_duration_minutes"] = totals["duration_seconds"] / totals["calls"] / 60
+
+            categories = pd.DataFrame(
+                [(s, category, count) for s in starts for category, count in buckets[s]["categories"].items()],
+                columns=["bucket", "category", "calls"]
+            )
+            categories["bucket"] = pd.to_datetime(categories["bucket"])
+            self._frames[granularity] = (totals, categories)
+        return self._frames[granularity]
+
+    def totals(self, granularity, start=None, end=None):
+        return _between(self._frame(granularity)[0], start, end)
+
+    def category_mix(self, granularity, start=None, end=None):
+        return _between(self._frame(granularity)[1], start, end)
+
+
+def _between(frame, start, end):
+    import pandas as pd
+
+    if start is not None:
+        frame = frame[frame["bucket"] >= pd.Timestamp(start)]
+    if end is not None:
+        frame = frame[frame["bucket"] < pd.Timestamp(end)]
+    return frame
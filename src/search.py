@@ -0,0 +1,117 @@
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+from dedup import extract_rx_number
+
+_QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+# Rowids are the call's timestamp in milliseconds since _ROWID_EPOCH, shifted
+# left to leave room for a sequence number among calls in the same millisecond
+_ROWID_EPOCH = datetime(2000, 1, 1)
+_ROWID_SEQUENCE_BITS = 20
+
+
+def build_match_query(text):
+    # Turn free text from the search box into an FTS5 MATCH expression.
+    # "quoted text" is a phrase query, a trailing * makes a prefix query,
+    # and every other term is quoted so punctuation (CALL-1F0C..., (555))
+    # is tokenized instead of being parsed as FTS5 syntax.
+    terms = []
+    for phrase, word in _QUERY_PATTERN.findall(text):
+        term = phrase if phrase else word
+        prefix = not phrase and term.endswith("*")
+        term = term.rstrip("*").replace('"', "")
+        if not any(ch.isalnum() for ch in term):
+            continue
+        terms.append(f'"{term}"' + (" *" if prefix else ""))
+    return " ".join(terms)
+
+
+class VoicemailSearchIndex:
+    # Full-text index over voicemail message, customer name, call ID and RX
+    # number. The FTS5 table is contentless: it only stores the inverted
+    # index, and its rowid points at the small `voicemails` table, which
+    # also makes adding a batch idempotent so calls can be fed in as they
+    # are ingested. Rowids follow the calls' timestamps, not the order they
+    # were added, so a backfill of older calls still sorts behind the inbox.
+
+    def __init__(self, path=":memory:"):
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS voicemails (
+                id INTEGER PRIMARY KEY,
+                call_id TEXT NOT NULL UNIQUE,
+                timestamp TEXT NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS voicemail_fts USING fts5(
+                message, customer_name, call_id, rx_number,
+                content='', tokenize='unicode61'
+            );
+        """)
+        self._sequence = 0
+
+    def _insert_voicemail(self, call):
+        # Insert the call under its timestamp's rowid; calls that land on the same
+        # millisecond and sequence number (a million inserts apart) take the next rowid
+        milliseconds = max(0, (call["timestamp"] - _ROWID_EPOCH) // timedelta(milliseconds=1))
+        self._sequence = (self._sequence + 1) % (1 << _ROWID_SEQUENCE_BITS)
+        rowid = milliseconds << _ROWID_SEQUENCE_BITS | self._sequence
+        while True:
+            try:
+                self.conn.execute(
+                    "INSERT INTO voicemails (id, call_id, timestamp) VALUES (?, ?, ?)",
+                    (rowid, call["call_id"], call["timestamp"].isoformat())
+                )
+                return rowid
+            except sqlite3.IntegrityError:
+                rowid += 1
+
+    def add_calls(self, calls):
+        added = 0
+        with self.conn:
+            for call in calls:
+                if self.conn.execute("SELECT 1 FROM voicemails WHERE call_id = ?", (call["call_id"],)).fetchone():
+                    continue
+                rowid = self._insert_voicemail(call)
+                voicemail = call["voicemail_data"]
+                self.conn.execute(
+                    "INSERT INTO voicemail_fts (rowid, message, customer_name, call_id, rx_number) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (rowid, voicemail["message"], call["customer_name"],
+                     call["call_id"], extract_rx_number(voicemail) or "")
+                )
+                added += 1
+        return added
+
+    def search(self, text, page=1, page_size=20):
+        match = build_match_query(text)
+        if not match:
+            return {"call_ids": [], "total": 0, "page": 1, "page_size": page_size}
+
+        total = self.conn.execute(
+            "SELECT count(*) FROM voicemail_fts WHERE voicemail_fts MATCH ?", (match,)
+        ).fetchone()[0]
+        page = max(1, min(page, (total + page_size - 1) // page_size or 1))
+        # Newest first: rowids follow call timestamps, and FTS5 can walk its
+        # doclists backwards by rowid, so a page never sorts the full match set
+        rows = self.conn.execute(
+            """
+            SELECT v.call_id
+            FROM (
+                SELECT rowid FROM voicemail_fts
+                WHERE voicemail_fts MATCH ?
+                ORDER BY rowid DESC
+                LIMIT ? OFFSET ?
+            ) AS hits
+            JOIN voicemails AS v ON v.id = hits.rowid
+            ORDER BY hits.rowid DESC
+            """,
+            (match, page_size, (page - 1) * page_size)
+        ).fetchall()
+
+        return {
+            "call_ids": [row[0] for row in rows],
+            "total": total,
+            "page": page,
+            "page_size": page_size
+        }
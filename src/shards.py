@@ -0,0 +1,179 @@
+import math
+from array import array
+
+import numpy as np
+
+from config import (DEFAULT_STORE_ID, SHARD_COMPUTE_NS_PER_CALL, SHARD_PICKLE_NS_PER_CALL, SHARD_TASK_OVERHEAD_MS,
+                    SHARD_UNPICKLE_NS_PER_CALL)
+
+URGENT_STATUS = "Urgent"
+
+
+class _Vocabulary:
+    # Small-integer codes for statuses and categories, shared by all shards
+    # so per-shard counts line up when they are merged
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class StoreShard:
+    # One pharmacy location: its calls, a row per call ID, and the columns the
+    # regional metrics are computed from. Columns are compact arrays so a
+    # shard can be shipped to a worker process as a few byte buffers.
+
+    def __init__(self, store_id, statuses, categories):
+        self.store_id = store_id
+        self.statuses = statuses
+        self.categories = categories
+        self.calls = []
+        self.rows_by_call_id = {}
+        self.status_column = array("H")
+        self.category_column = array("H")
+        self.duration_column = array("I")
+        self.callback_column = array("B")
+
+    def __len__(self):
+        return len(self.calls)
+
+    def add_call(self, call):
+        row = len(self.calls)
+        self.calls.append(call)
+        self.rows_by_call_id[call["call_id"]] = row
+        self.status_column.append(self.statuses.code(call["status"]))
+        self.category_column.append(self.categories.code(call["category"]))
+        self.duration_column.append(call.get("duration_seconds", 0))
+        self.callback_column.append(bool(call["callback_required"]))
+
+    def update_call(self, call):
+        # Refresh the columns after a status change or callback
+        row = self.rows_by_call_id.get(call["call_id"])
+        if row is None:
+            return
+        self.status_column[row] = self.statuses.code(call["status"])
+        self.callback_column[row] = bool(call["callback_required"])
+        self.calls[row] = call
+
+    def columns(self):
+        return {
+            "status": self.status_column,
+            "category": self.category_column,
+            "duration": self.duration_column,
+            "callback": self.callback_column,
+            "urgent_code": self.statuses.code(URGENT_STATUS),
+            "n_statuses": len(self.statuses.values),
+            "n_categories": len(self.categories.values)
+        }
+
+
+def compute_partial(columns):
+    # Additive per-shard totals; runs in a worker process when given an executor
+    status = np.frombuffer(columns["status"], dtype=np.uint16)
+    category = np.frombuffer(columns["category"], dtype=np.uint16)
+    duration = np.frombuffer(columns["duration"], dtype=np.uint32)
+    callback = np.frombuffer(columns["callback"], dtype=np.uint8)
+    urgent = status == columns["urgent_code"]
+    return {
+        "total_calls": int(status.size),
+        "urgent_calls": int(np.count_nonzero(urgent)),
+        "callbacks_needed": int(np.count_nonzero(callback)),
+        "duration_seconds": int(duration.sum(dtype=np.int64)),
+        "status_counts": np.bincount(status, minlength=columns["n_statuses"]),
+        "category_counts": np.bincount(category, minlength=columns["n_categories"]),
+        "urgent_category_counts": np.bincount(category[urgent], minlength=columns["n_categories"])
+    }
+
+
+def parallel_min_calls(stores, workers, compute_ns=SHARD_COMPUTE_NS_PER_CALL, pickle_ns=SHARD_PICKLE_NS_PER_CALL,
+                       unpickle_ns=SHARD_UNPICKLE_NS_PER_CALL, task_overhead_ms=SHARD_TASK_OVERHEAD_MS):
+    # Smallest region (in calls, split evenly over `stores` shards) that
+    # aggregates faster on `workers` processes than inline. The server pickles
+    # every shard and waits out each task's round trip in turn; the workers
+    # unpickle and compute side by side, ceil(stores / workers) shards each.
+    if workers < 2 or stores < 2:
+        return math.inf
+    rounds = -(-stores // workers)
+    saved_ns_per_call = compute_ns - pickle_ns - rounds / stores * (unpickle_ns + compute_ns)
+    if saved_ns_per_call <= 0:
+        return math.inf
+    return math.ceil(stores * task_overhead_ms * 1e6 / saved_ns_per_call)
+
+
+def _summarize(partial, statuses, categories):
+    total = partial["total_calls"]
+    return {
+        "total_calls": total,
+        "urgent_calls": partial["urgent_calls"],
+        "callbacks_needed": partial["callbacks_needed"],
+        "avg_duration_minutes": round(partial["duration_seconds"] / (total * 60), 1) if total > 0 else 0,
+        "statuses": {s: int(n) for s, n in zip(statuses, partial["status_counts"]) if n},
+        "categories": {c: int(n) for c, n in zip(categories, partial["category_counts"]) if n},
+        "urgent_by_category": {c: int(n) for c, n in zip(categories, partial["urgent_category_counts"]) if n}
+    }
+
+
+class ShardedInbox:
+    # Calls partitioned by store. Regional metrics are computed as one
+    # partial per shard (optionally in parallel on an executor) and merged,
+    # so no step ever concatenates the stores' calls.
+
+    def __init__(self):
+        self.statuses = _Vocabulary([URGENT_STATUS])
+        self.categories = _Vocabulary()
+        self.shards = {}
+
+    def shard(self, store_id):
+        if store_id not in self.shards:
+            self.shards[store_id] = StoreShard(store_id, self.statuses, self.categories)
+        return self.shards[store_id]
+
+    def add_calls(self, calls):
+        for call in calls:
+            self.shard(call.get("store_id", DEFAULT_STORE_ID)).add_call(call)
+
+    def update_call(self, call):
+        shard = self.shards.get(call.get("store_id", DEFAULT_STORE_ID))
+        if shard is not None:
+            shard.update_call(call)
+
+    def store_ids(self):
+        return sorted(self.shards)
+
+    def size(self, store_ids=None):
+        return sum(len(self.shards[s]) for s in store_ids or self.shards)
+
+    def aggregate(self, store_ids=None, executor=None):
+        store_ids = list(store_ids or self.store_ids())
+        # Read the vocabularies once so every partial is padded to the same length
+        columns = [self.shards[store_id].columns() for store_id in store_ids]
+        n_statuses, n_categories = len(self.statuses.values), len(self.categories.values)
+        for shard_columns in columns:
+            shard_columns["n_statuses"], shard_columns["n_categories"] = n_statuses, n_categories
+        mapper = executor.map if executor is not None else map
+        partials = list(mapper(compute_partial, columns))
+
+        statuses, categories = self.statuses.values[:n_statuses], self.categories.values[:n_categories]
+        merged = {
+            key: sum(partial[key] for partial in partials)
+            for key in ("total_calls", "urgent_calls", "callbacks_needed", "duration_seconds")
+        }
+        for key, length in (("status_counts", n_statuses), ("category_counts", n_categories),
+                            ("urgent_category_counts", n_categories)):
+            merged[key] = sum((partial[key] for partial in partials), np.zeros(length, dtype=np.int64))
+
+        region = _summarize(merged, statuses, categories)
+        region["by_store"] = {
+            store_id: _summarize(partial, statuses, categories)
+            for store_id, partial in zip(store_ids, partials)
+        }
+        return region
@@ -0,0 +1,65 @@
+import threading
+
+from rollups import RollupStore
+from search import VoicemailSearchIndex
+from shards import ShardedInbox
+
+
+class CallStores:
+    # The stores derived from ingested calls: history, search index, rollups
+    # and store shards. The dashboard keeps one per server process, built
+    # from the event log once and fed every call as it is ingested, so a new
+    # session only restores its own inbox. Sessions run on their own script
+    # threads; every read or write of the stores takes `lock`.
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.call_history = []
+        self.calls_by_id = {}
+        self.search_index = VoicemailSearchIndex()
+        self.rollups = RollupStore()
+        self.region = ShardedInbox()
+        self._audit_frame = None
+        self._audit_frame_size = None
+
+    def ingest(self, calls, index=True, shard=True):
+        with self.lock:
+            # Calls already fed in (e.g. a batch another session just logged) are skipped
+            calls = [call for call in calls if call["call_id"] not in self.calls_by_id]
+            for call in calls:
+                self.calls_by_id[call["call_id"]] = call
+            self.call_history.extend(calls)
+            self.rollups.ingest(calls)
+            if shard:
+                self.region.add_calls(calls)
+            if index:
+                self.search_index.add_calls(calls)
+        return len(calls)
+
+    def update_call(self, call):
+        # Status changes and callbacks from a session's inbox copy
+        with self.lock:
+            stored = self.calls_by_id.get(call["call_id"])
+            if stored is not None:
+                stored["status"] = call["status"]
+                stored["callback_required"] = call["callback_required"]
+                self.region.update_call(stored)
+
+    def search(self, text, page=1, page_size=20):
+        # Every indexed call was ingested here, so each hit resolves to a call
+        # and the total only counts voicemails that can be shown. Hits come
+        # back as copies so a session can edit them like its own inbox.
+        with self.lock:
+            results = self.search_index.search(text, page=page, page_size=page_size)
+            results["calls"] = [dict(self.calls_by_id[call_id]) for call_id in results["call_ids"]]
+        return results
+
+    def audit_frame(self):
+        # Flattened once per ingest and shared; filtering it never mutates it
+        from audit import flatten_audit_frame
+
+        with self.lock:
+            if self._audit_frame_size != len(self.call_history):
+                self._audit_frame = flatten_audit_frame(self.call_history)
+                self._audit_frame_size = len(self.call_history)
+            return self._audit_frame
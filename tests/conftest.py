@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The app's modules import each other as top-level modules, the way
+# `streamlit run src/main.py` puts src/ on the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from cli import _json_default, main
+from generators import generate_sample_calls
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def write_jsonl(path, calls):
+    with open(path, "w") as f:
+        for call in calls:
+            f.write(json.dumps(call, default=_json_default) + "\n")
+
+
+def test_parquet_keeps_fields_missing_from_first_chunk(tmp_path):
+    calls = generate_sample_calls(5)
+    for call in calls[:2]:
+        del call["store_id"]
+    write_jsonl(tmp_path / "calls.jsonl", calls)
+
+    main(["--input", str(tmp_path / "calls.jsonl"), "--output", str(tmp_path / "out.parquet"),
+          "--workers", "1", "--chunk-size", "2"])
+
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert table.num_rows == 5
+    assert table.column("store_id").to_pylist() == [None, None] + [call["store_id"] for call in calls[2:]]
+
+
+def test_parquet_empty_input_writes_schema(tmp_path):
+    (tmp_path / "calls.jsonl").write_text("")
+
+    main(["--input", str(tmp_path / "calls.jsonl"), "--output", str(tmp_path / "out.parquet"), "--workers", "1"])
+
+    table = pq.read_table(tmp_path / "out.parquet")
+    assert table.num_rows == 0
+    assert "store_id" in table.schema.names
+
+
+def test_parquet_rejects_unknown_fields(tmp_path):
+    calls = generate_sample_calls(1)
+    calls[0]["extra"] = 1
+    write_jsonl(tmp_path / "calls.jsonl", calls)
+
+    with pytest.raises(ValueError, match="extra"):
+        main(["--input", str(tmp_path / "calls.jsonl"), "--output", str(tmp_path / "out.parquet"), "--workers", "1"])
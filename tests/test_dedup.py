@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+
+from dedup import extract_rx_number, group_calls
+from generators import generate_sample_calls
+
+REFILL = ("Hi this is {name} calling about my blood pressure medication refill, "
+          "I am almost out and need it before the weekend, please call me back at your earliest convenience")
+REFILL_AGAIN = ("Hi this is {name} calling about my blood pressure medication refill, "
+                "I am almost out and need it before the weekend, please call me back as soon as you can")
+INSURANCE = "Hello, {name} here with a question about whether my new insurance plan covers the generic version"
+
+_BASE_TIME = datetime(2024, 10, 1, 9, 0)
+
+
+def make_call(call_id, name, message, phone=None, rx=None, minutes=0):
+    return {
+        "call_id": call_id,
+        "customer_name": name,
+        "timestamp": _BASE_TIME + timedelta(minutes=minutes),
+        "voicemail_data": {
+            "message": message.format(name=name),
+            "callback_number": phone,
+            "prescription_mentioned": rx,
+            "urgent": False
+        }
+    }
+
+
+def thread_of(threads, call_id):
+    return next(t for t in threads if any(c["call_id"] == call_id for c in t["calls"]))
+
+
+def call_ids(thread):
+    return {c["call_id"] for c in thread["calls"]}
+
+
+def test_same_callback_number_is_one_thread():
+    threads = group_calls([
+        make_call("A", "Sarah Johnson", REFILL, phone="(555) 123-4567"),
+        make_call("B", "S. Johnson", INSURANCE, phone="+1 555 123 4567", minutes=30),
+    ])
+    assert len(threads) == 1
+    assert threads[0]["latest"]["call_id"] == "B"
+    assert threads[0]["thread_id"] == "THREAD-A"
+
+
+def test_same_customer_and_rx_is_one_thread_across_phones():
+    threads = group_calls([
+        make_call("A", "Sarah Johnson", REFILL, phone="(555) 123-4567", rx="RX123456"),
+        make_call("B", "Sarah Johnson", INSURANCE, phone="(555) 987-6543", rx="rx123456", minutes=5),
+    ])
+    assert len(threads) == 1
+
+
+def test_near_duplicate_messages_are_one_thread():
+    threads = group_calls([
+        make_call("A", "Sarah Johnson", REFILL),
+        make_call("B", "Sarah Johnson", REFILL_AGAIN, minutes=60),
+        make_call("C", "Sarah Johnson", INSURANCE, minutes=90),
+    ])
+    assert call_ids(thread_of(threads, "A")) == {"A", "B"}
+    assert call_ids(thread_of(threads, "C")) == {"C"}
+
+
+def test_near_duplicate_messages_from_different_customers_stay_apart():
+    threads = group_calls([
+        make_call("A", "Sarah Johnson", REFILL.format(name="a patient")),
+        make_call("B", "Michael Chen", REFILL.format(name="a patient"), minutes=1),
+    ])
+    assert len(threads) == 2
+
+
+def test_different_rx_numbers_never_share_a_thread():
+    threads = group_calls([
+        make_call("A", "Sarah Johnson", REFILL, phone="(555) 123-4567", rx="RX111111"),
+        make_call("B", "Sarah Johnson", REFILL_AGAIN, phone="(555) 123-4567", rx="RX222222", minutes=1),
+    ])
+    assert len(threads) == 2
+
+
+def test_calls_refused_by_the_first_bucket_member_still_group():
+    # Same phone: the RX B calls can't join the RX A call, but belong together
+    threads = group_calls([
+        make_call("A", "Sarah Johnson", REFILL, phone="(555) 123-4567", rx="RX111111"),
+        make_call("B1", "Michael Chen", INSURANCE, phone="(555) 123-4567", rx="RX222222", minutes=1),
+        make_call("B2", "Emma Wilson", INSURANCE, phone="(555) 123-4567", rx="RX222222", minutes=2),
+    ])
+    assert call_ids(thread_of(threads, "A")) == {"A"}
+    assert call_ids(thread_of(threads, "B1")) == {"B1", "B2"}
+
+
+def test_similar_wording_never_bridges_different_callback_numbers():
+    # The phone-less call comes first and is similar to both, but 111 and 333 must not meet
+    threads = group_calls([
+        make_call("B", "Sarah Johnson", REFILL),
+        make_call("A", "Sarah Johnson", REFILL, phone="(111) 111-1111", minutes=1),
+        make_call("C", "Sarah Johnson", REFILL_AGAIN, phone="(333) 333-3333", minutes=2),
+    ])
+    assert thread_of(threads, "A") is not thread_of(threads, "C")
+
+
+def test_generated_threads_never_mix_rx_numbers():
+    calls = generate_sample_calls(2000)
+    # Repeat callers: the same phone about a different prescription, and an exact re-send
+    for n, call in enumerate(calls[:200]):
+        repeat = {**call, "call_id": f"{call['call_id']}-R",
+                  "voicemail_data": {**call["voicemail_data"], "prescription_mentioned": f"RX{900000 + n}"}}
+        resend = {**call, "call_id": f"{call['call_id']}-S"}
+        calls.extend([repeat, resend])
+
+    threads = group_calls(calls)
+    assert sum(t["size"] for t in threads) == len(calls)
+    for thread in threads:
+        assert len({extract_rx_number(c["voicemail_data"]) for c in thread["calls"]} - {None}) <= 1
+    for call in calls[:200]:
+        assert f"{call['call_id']}-S" in call_ids(thread_of(threads, call["call_id"]))
@@ -0,0 +1,31 @@
+import pytest
+
+from eventlog import EventLog
+from generators import generate_sample_calls
+
+
+def test_backfilled_calls_survive_reopen_without_joining_the_inbox(tmp_path):
+    log = EventLog(tmp_path, snapshot_every=5)
+    inbox = generate_sample_calls(3)
+    history = generate_sample_calls(4)
+    for call in inbox:
+        log.append("ingested", call["call_id"], call=call, batch="batch-1")
+    for call in history:
+        log.append("backfilled", call["call_id"], call=call, source="history")
+    log.close()
+
+    # Reopening loads the snapshot written after five events and replays the rest
+    log = EventLog(tmp_path, snapshot_every=5)
+    assert log.state["inbox"] == [call["call_id"] for call in inbox]
+    assert set(log.state["calls"]) == {call["call_id"] for call in inbox + history}
+    assert log.state["sources"] == {call["call_id"]: "history" for call in history}
+    log.close()
+
+
+def test_backfilled_call_cannot_be_logged_twice(tmp_path):
+    log = EventLog(tmp_path)
+    call = generate_sample_calls(1)[0]
+    log.append("backfilled", call["call_id"], call=call, source="stores")
+    with pytest.raises(ValueError):
+        log.append("backfilled", call["call_id"], call=call, source="stores")
+    log.close()
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+from generators import generate_sample_calls
+from search import VoicemailSearchIndex
+
+
+def make_calls(count, start, step):
+    calls = generate_sample_calls(count)
+    for i, call in enumerate(calls):
+        call["timestamp"] = start + i * step
+        call["voicemail_data"]["message"] = f"please refill my prescription {i}"
+    return calls
+
+
+def test_hits_are_newest_first_whatever_order_calls_are_added():
+    calls = make_calls(30, datetime(2026, 1, 1), timedelta(hours=1))
+    index = VoicemailSearchIndex()
+    # A backfill of older calls added after the newer inbox
+    index.add_calls(calls[20:])
+    index.add_calls(calls[:20])
+
+    newest_first = [call["call_id"] for call in reversed(calls)]
+    assert index.search("refill", page_size=10)["call_ids"] == newest_first[:10]
+    assert index.search("refill", page=3, page_size=10)["call_ids"] == newest_first[20:]
+
+
+def test_calls_in_the_same_millisecond_are_all_indexed():
+    calls = make_calls(5, datetime(2026, 1, 1), timedelta(0))
+    index = VoicemailSearchIndex()
+    index._sequence = (1 << 20) - 2  # wrap the sequence onto rowids already taken
+    assert index.add_calls(calls[:2]) == 2
+    index._sequence = (1 << 20) - 2
+    assert index.add_calls(calls[2:]) == 3
+    assert index.search("refill")["total"] == 5
+
+
+def test_adding_a_call_twice_is_ignored():
+    calls = make_calls(3, datetime(2026, 1, 1), timedelta(minutes=1))
+    index = VoicemailSearchIndex()
+    assert index.add_calls(calls) == 3
+    assert index.add_calls(calls + calls[:1]) == 0
+    assert index.search("refill")["total"] == 3
@@ -0,0 +1,40 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+from generators import generate_sample_calls
+from shards import ShardedInbox, parallel_min_calls
+
+
+def test_aggregate_on_executor_matches_inline():
+    region = ShardedInbox()
+    for store_id in ("STORE-001", "STORE-002", "STORE-003"):
+        region.add_calls(generate_sample_calls(50, store_id=store_id))
+
+    with ThreadPoolExecutor(2) as executor:
+        assert region.aggregate(executor=executor) == region.aggregate()
+    assert region.aggregate()["total_calls"] == 150
+
+
+def test_update_call_moves_status_counts():
+    region = ShardedInbox()
+    calls = generate_sample_calls(20)
+    calls[0]["status"] = "New"
+    region.add_calls(calls)
+    before = region.aggregate()["statuses"]
+
+    region.update_call(dict(calls[0], status="In Progress"))
+
+    after = region.aggregate()["statuses"]
+    assert after.get("New", 0) == before["New"] - 1
+    assert after["In Progress"] == before.get("In Progress", 0) + 1
+    assert sum(after.values()) == 20
+
+
+def test_parallel_min_calls():
+    # Nothing to split across workers with one core or one store
+    assert parallel_min_calls(12, 1) == math.inf
+    assert parallel_min_calls(1, 8) == math.inf
+    # More cores pay off sooner
+    assert parallel_min_calls(12, 2) > parallel_min_calls(12, 4) > parallel_min_calls(12, 12)
+    # Shipping a shard costing more than computing it never pays off
+    assert parallel_min_calls(12, 12, compute_ns=1, pickle_ns=2) == math.inf